@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# =============================================
+# MECHAUTOMATION QUANTUM ENGINE BENCHMARK v1.0
+# Banco de pruebas de rendimiento del motor cuántico
+# =============================================
+"""
+Mide el motor cuántico contra el simulador Aer local (sin red):
+
+    python core/benchmark_quantum_engine.py --output bench.json
+    python core/benchmark_quantum_engine.py --baseline bench.json
+
+Cada escenario informa throughput, latencias p50/p99 y pico de RSS del
+proceso y de sus hijos vivos (muestreado en /proc durante el escenario). Con
+--baseline se comparan p50 y throughput contra un resultado guardado y el
+proceso termina con código 1 si alguno empeora más que --tolerance.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import resource
+import sys
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+import quantum_engine as qe
+
+
+def _process_rss_mb(pid):
+    """Memoria residente actual de un proceso (MB), 0 si ya no existe"""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def _tree_rss_mb():
+    """RSS del proceso más el de sus hijos vivos (trabajadores del pool)"""
+    pid = os.getpid()
+    total = _process_rss_mb(pid)
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                # El nombre puede contener espacios: los campos siguen a ')'
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            total += _process_rss_mb(entry)
+    return total
+
+
+class PeakRss:
+    """Muestrea en un hilo el RSS del árbol de procesos durante un escenario"""
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.peak = 0.0
+        self._stop = threading.Event()
+        
+    def __enter__(self):
+        if os.path.isdir('/proc'):
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+        else:
+            self._thread = None
+        return self
+    
+    def __exit__(self, *exc):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self.peak = max(self.peak, _tree_rss_mb())
+        else:
+            # Sin /proc solo queda el máximo acumulado del proceso (macOS: bytes)
+            scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+            self.peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+            
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, _tree_rss_mb())
+            self._stop.wait(self.interval)
+
+
+def _summarize(latencies, items, peak_rss_mb):
+    """Estadísticas de un escenario a partir de sus latencias (s)"""
+    latencies = np.asarray(latencies)
+    total = float(latencies.sum())
+    return {
+        'runs': int(latencies.size),
+        'throughput': items / total if total else 0.0,
+        'p50_ms': float(np.percentile(latencies, 50) * 1000),
+        'p99_ms': float(np.percentile(latencies, 99) * 1000),
+        'peak_rss_mb': peak_rss_mb
+    }
+
+
+def _random_states(rng, count, num_qubits):
+    """Vectores de estado normalizados de 2**num_qubits amplitudes"""
+    states = rng.standard_normal((count, 2**num_qubits))
+    return states / np.linalg.norm(states, axis=1, keepdims=True)
+
+
+def _process_qubits(engine, process_type, default_qubits):
+    """Qubits compatibles con las compuertas que aplica cada tipo de proceso"""
+    gate = {'temporal': 'temporal_shift', 'high_energy': 'warp'}.get(process_type)
+    if gate is None:
+        return default_qubits
+    return int(np.log2(engine._gate_matrix(gate).shape[0]))
+
+
+def bench_construction(dimensions, repeat):
+    """Coste de construir el motor para cada número de dimensiones"""
+    scenarios = {}
+    for dims in dimensions:
+        latencies = []
+        with PeakRss() as rss:
+            for _ in range(repeat):
+                started = time.perf_counter()
+                qe.QuantumEngine(dimensions=dims, verbose=False)
+                latencies.append(time.perf_counter() - started)
+        stats = _summarize(latencies, repeat, rss.peak)
+        stats['within_budget'] = stats['p50_ms'] / 1000 <= qe.STARTUP_BUDGET
+        scenarios[f'construct/d{dims}'] = stats
+    return scenarios
+
+
+def bench_process(engine, process_types, qubits, iterations, rng):
+    """Latencia de execute_quantum_process sin caché por tipo de proceso"""
+    scenarios = {}
+    for process_type in process_types:
+        num_qubits = _process_qubits(engine, process_type, qubits)
+        states = _random_states(rng, iterations, num_qubits)
+        # Calentamiento: backend, compuertas y plantilla transpilada
+        engine.execute_quantum_process(states[0], process_type, use_cache=False)
+        latencies = []
+        with PeakRss() as rss:
+            for state in states:
+                started = time.perf_counter()
+                engine.execute_quantum_process(state, process_type, use_cache=False)
+                latencies.append(time.perf_counter() - started)
+        scenarios[f'process/{process_type}/q{num_qubits}'] = _summarize(
+            latencies, iterations, rss.peak)
+    return scenarios
+
+
+def bench_parallel(engine, stream_lengths, qubits, repeat, rng):
+    """Throughput de parallel_dimension_process por longitud de flujo"""
+    scenarios = {}
+    engine.parallel_dimension_process(_random_states(rng, engine.workers, qubits))
+    for length in stream_lengths:
+        latencies = []
+        # Los trabajadores del pool siguen vivos: su RSS entra en la muestra
+        with PeakRss() as rss:
+            for _ in range(repeat):
+                stream = _random_states(rng, length, qubits)
+                started = time.perf_counter()
+                engine.parallel_dimension_process(stream)
+                latencies.append(time.perf_counter() - started)
+        scenarios[f'parallel/n{length}/q{qubits}'] = _summarize(
+            latencies, length * repeat, rss.peak)
+    return scenarios
+
+
+def compare(current, baseline, tolerance):
+    """Lista de regresiones de p50 y throughput respecto al baseline"""
+    regressions = []
+    for name, stats in current['scenarios'].items():
+        reference = baseline.get('scenarios', {}).get(name)
+        if reference is None:
+            continue
+        if stats['p50_ms'] > reference['p50_ms'] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p50 {stats['p50_ms']:.2f}ms > {reference['p50_ms']:.2f}ms")
+        if stats['throughput'] < reference['throughput'] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {stats['throughput']:.1f}/s < {reference['throughput']:.1f}/s")
+    return regressions
+
+
+def _int_list(value):
+    """Interpreta '3-12' o '8,32,128' como lista de enteros"""
+    if '-' in value:
+        start, end = value.split('-')
+        return list(range(int(start), int(end) + 1))
+    return [int(item) for item in value.split(',')]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del Quantum Engine")
+    parser.add_argument('--dimensions', type=_int_list, default=_int_list('3-12'),
+                        help="Dimensiones para el escenario de construcción")
+    parser.add_argument('--process-types', default='standard,temporal,high_energy')
+    parser.add_argument('--qubits', type=int, default=4,
+                        help="Qubits de entrada para procesos sin compuertas fijas")
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--stream-lengths', type=_int_list, default=_int_list('8,32,128'))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=1337)
+    parser.add_argument('--output', help="Ruta del informe JSON (por defecto stdout)")
+    parser.add_argument('--baseline', help="Informe JSON previo contra el que comparar")
+    parser.add_argument('--tolerance', type=float, default=0.15)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    report = {
+        'metadata': {
+            'engine': 'v4.7.2',
+            'created': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'seed': args.seed
+        },
+        'scenarios': {}
+    }
+
+    # Los mensajes del motor (p. ej. emergency_shutdown) van a stderr:
+    # stdout queda reservado para el informe JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        report['scenarios'].update(bench_construction(args.dimensions, args.repeat))
+        with qe.QuantumEngine(verbose=False, workers=args.workers) as engine:
+            report['scenarios'].update(bench_process(
+                engine, args.process_types.split(','), args.qubits, args.iterations, rng))
+            report['scenarios'].update(bench_parallel(
+                engine, args.stream_lengths, args.qubits, args.repeat, rng))
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(payload)
+    else:
+        print(payload)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"🚨 Regresión: {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+        print("✅ Sin regresiones respecto al baseline", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,20 +5,29 @@
 # Núcleo de procesamiento paralelo dimensional
 # =============================================
 
+# Qiskit, multiprocessing y las librerías dimensionales se importan en el
+# primer uso: un proceso que solo construye el motor o usa exact=True no
+# paga su tiempo de carga.
 import numpy as np
-from qiskit import QuantumCircuit, execute, Aer
-from qiskit.quantum_info import Statevector
-from qiskit.extensions import UnitaryGate
-import tensorflow as tf
-from multiprocessing import Pool
-import dimensional_lib as dim
-import temporal_sync as ts
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from collections.abc import Mapping
 import warnings
 
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
+# Presupuesto de arranque (segundos) para construir un QuantumEngine
+STARTUP_BUDGET = 0.25
+
 class QuantumEngine:
-    def __init__(self, dimensions=4, warp_factor=7, stability_threshold=0.95):
+    def __init__(self, dimensions=4, warp_factor=7, stability_threshold=0.95,
+                 shots=1024, cache_size=256, cache_ttl=None, workers=None,
+                 verbose=True):
         """
         Inicializa el motor cuántico con parámetros dimensionales
         
@@ -26,14 +35,49 @@ class QuantumEngine:
             dimensions (int): Número de dimensiones paralelas (3-12)
             warp_factor (int): Nivel de energía para procesamiento (1-11)
             stability_threshold (float): Umbral de estabilidad del continuum (0.0-1.0)
+            shots (int): Mediciones por circuito
+            cache_size (int): Máximo de resultados en la caché cuántica (0 la desactiva)
+            cache_ttl (float): Segundos de validez de cada resultado (None = sin expiración)
+            workers (int): Procesos del pool dimensional (None = núcleos disponibles)
+            verbose (bool): Muestra el progreso de arranque
         """
+        started = time.perf_counter()
         self.dimensions = self._validate_dimensions(dimensions)
         self.warp_factor = warp_factor
         self.stability = stability_threshold
-        self.backend = Aer.get_backend('qasm_simulator')
-        self.quantum_cache = {}
+        self.shots = shots
+        self.verbose = verbose
+        self._backend = None
+        self.quantum_cache = OrderedDict()
+        self.circuit_templates = {}
+        self._lock = threading.RLock()
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = None
+        self._pool_config = None
         self.temporal_lock = False
         self._init_engine()
+        self.startup_time = time.perf_counter() - started
+        if self.startup_time > STARTUP_BUDGET:
+            warnings.warn(
+                f"Arranque del motor cuántico en {self.startup_time:.3f}s "
+                f"(presupuesto {STARTUP_BUDGET}s)", RuntimeWarning)
+        
+    @property
+    def warp_factor(self):
+        """Nivel de energía del motor"""
+        return self._warp_factor
+    
+    @warp_factor.setter
+    def warp_factor(self, factor):
+        """Cambiar el warp descarta la compuerta warp ya construida"""
+        self._warp_factor = factor
+        # Las plantillas se indexan por warp; las compuertas no, se reconstruyen
+        getattr(self, '_gate_matrices', {}).pop('warp', None)
+        getattr(self, '_gates', {}).pop('warp', None)
         
     def _validate_dimensions(self, dims):
         """Asegura que las dimensiones estén en rango permitido"""
@@ -43,19 +87,66 @@ class QuantumEngine:
         
     def _init_engine(self):
         """Inicializa los componentes del motor"""
-        print(f"⚛️ Iniciando Quantum Engine v4.7.2 en {self.dimensions}D...")
+        if self.verbose:
+            print(f"⚛️ Iniciando Quantum Engine v4.7.2 en {self.dimensions}D...")
         self._load_quantum_gates()
         self._calibrate_warp(self.warp_factor)
         self._stabilize_continuum()
-        print("✅ Motor cuántico listo para procesamiento interdimensional")
+        if self.verbose:
+            print("✅ Motor cuántico listo para procesamiento interdimensional")
+        
+    @property
+    def backend(self):
+        """Simulador Aer, creado en el primer circuito ejecutado"""
+        with self._lock:
+            if self._backend is None:
+                from qiskit import Aer
+                self._backend = Aer.get_backend('qasm_simulator')
+            return self._backend
         
     def _load_quantum_gates(self):
-        """Carga compuertas cuánticas personalizadas"""
-        self.gates = {
-            'warp': UnitaryGate(self._create_warp_matrix()),
-            'temporal_shift': UnitaryGate(ts.get_temporal_operator()),
-            'dimensional_fold': UnitaryGate(dim.folding_operator())
+        """Registra las compuertas cuánticas personalizadas (construcción perezosa)"""
+        self._gate_builders = {
+            'warp': self._create_warp_matrix,
+            'temporal_shift': self._create_temporal_matrix,
+            'dimensional_fold': self._create_fold_matrix
         }
+        self._gate_matrices = {}
+        self._gates = {}
+        
+    def _gate_matrix(self, name):
+        """Matriz de una compuerta, construida en su primer uso"""
+        if name not in self._gate_matrices:
+            self._gate_matrices[name] = np.asarray(
+                self._gate_builders[name](), dtype=np.complex128)
+        return self._gate_matrices[name]
+        
+    def _gate(self, name):
+        """Compuerta Qiskit envolviendo la matriz correspondiente"""
+        if name not in self._gates:
+            from qiskit.extensions import UnitaryGate
+            self._gates[name] = UnitaryGate(self._gate_matrix(name))
+        return self._gates[name]
+        
+    @property
+    def gate_matrices(self):
+        """Todas las matrices de compuertas personalizadas"""
+        return {name: self._gate_matrix(name) for name in self._gate_builders}
+        
+    @property
+    def gates(self):
+        """Todas las compuertas personalizadas como UnitaryGate"""
+        return {name: self._gate(name) for name in self._gate_builders}
+        
+    def _create_temporal_matrix(self):
+        """Operador de desplazamiento temporal"""
+        import temporal_sync as ts
+        return ts.get_temporal_operator()
+        
+    def _create_fold_matrix(self):
+        """Operador de doblado dimensional"""
+        import dimensional_lib as dim
+        return dim.folding_operator()
         
     def _create_warp_matrix(self):
         """Genera matriz de curvatura espacial basada en warp factor"""
@@ -72,76 +163,312 @@ class QuantumEngine:
         
     def _stabilize_continuum(self):
         """Estabiliza el continuum espacio-temporal"""
-        stability_matrix = np.eye(2**self.dimensions) * self.stability
-        np.fill_diagonal(stability_matrix, 1.0)
-        self.stability_field = Statevector(stability_matrix)
+        # El campo es diagonal (fill_diagonal fija cada entrada a 1.0), así que
+        # basta con su diagonal; la matriz densa 4^d solo se construye bajo demanda
+        self.stability_diagonal = np.broadcast_to(1.0, (2**self.dimensions,))
+        self._stability_field = None
         
-    def execute_quantum_process(self, input_data, process_type='standard'):
+    @property
+    def stability_field(self):
+        """Operador de estabilidad denso, materializado en el primer acceso"""
+        if self._stability_field is None:
+            from qiskit.quantum_info import Operator
+            self._stability_field = Operator(np.diag(self.stability_diagonal))
+        return self._stability_field
+        
+    def execute_quantum_process(self, input_data, process_type='standard',
+                                use_cache=True, exact=False, compact=False):
         """
         Ejecuta proceso cuántico en datos de entrada
         
         Args:
             input_data: Datos a procesar (formato multidimensional)
             process_type: Tipo de procesamiento ('standard', 'temporal', 'high_energy')
+            use_cache: Reutiliza resultados previos idénticos (False fuerza un nuevo muestreo)
+            exact: Calcula la distribución exacta con NumPy sin muestreo ni Qiskit;
+                admite un lote 2-D de entradas y devuelve entonces una lista
+            compact: Devuelve un QuantumResult respaldado por un array denso
             
         Returns:
             Resultados del procesamiento cuántico
         """
         if self.temporal_lock:
             raise RuntimeError("Motor bloqueado por paradoja temporal")
+        
+        if exact:
+            return self._exact_distribution(input_data, process_type, compact)
+        
+        cache_key = None
+        if use_cache and self.cache_size > 0:
+            cache_key = self._cache_key(input_data, process_type)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return self._decode_result(cached, compact)
             
         circuit = self._create_quantum_circuit(input_data, process_type)
         result = self._run_circuit(circuit)
-        return self._decode_result(result)
         
-    def _create_quantum_circuit(self, data, process_type):
-        """Construye circuito cuántico basado en tipo de procesamiento"""
-        num_qubits = int(np.ceil(np.log2(len(data))))
-        circuit = QuantumCircuit(num_qubits, num_qubits)
+        if cache_key is not None:
+            self._cache_put(cache_key, result)
+        return self._decode_result(result, compact)
+    
+    def execute_quantum_batch(self, inputs, process_type='standard', use_cache=True,
+                              compact=False):
+        """
+        Ejecuta un lote de procesos cuánticos en un único trabajo del backend
         
-        # Codificación de datos
-        circuit.initialize(Statevector(data), range(num_qubits))
+        Args:
+            inputs: Secuencia de datos de entrada (uno por circuito)
+            process_type: Tipo de procesamiento aplicado a todo el lote
+            use_cache: Reutiliza resultados previos idénticos
+            compact: Devuelve objetos QuantumResult en lugar de diccionarios
+            
+        Returns:
+            Lista de resultados en el mismo orden que las entradas
+        """
+        if self.temporal_lock:
+            raise RuntimeError("Motor bloqueado por paradoja temporal")
+        
+        results = [None] * len(inputs)
+        pending = {}
+        for idx, data in enumerate(inputs):
+            cache_key = None
+            if use_cache and self.cache_size > 0:
+                cache_key = self._cache_key(data, process_type)
+                cached = self._cache_get(cache_key)
+                if cached is not None:
+                    results[idx] = self._decode_result(cached, compact)
+                    continue
+            # Entradas repetidas dentro del lote comparten un único circuito
+            pending.setdefault(cache_key or idx, []).append((idx, data))
+        
+        if pending:
+            groups = list(pending.items())
+            circuits = [self._create_quantum_circuit(group[0][1], process_type)
+                        for _, group in groups]
+            for (cache_key, group), counts in zip(groups, self._run_circuits(circuits)):
+                if use_cache and self.cache_size > 0:
+                    self._cache_put(cache_key, counts)
+                for idx, _ in group:
+                    results[idx] = self._decode_result(counts, compact)
+        return results
+    
+    def _exact_distribution(self, data, process_type, compact=False):
+        """Distribución de salida exacta (|U·ψ|²) vectorizada sobre el lote"""
+        states = np.asarray(data, dtype=np.complex128)
+        single = states.ndim == 1
+        states = np.atleast_2d(states)
+        num_qubits = self._validate_states(states)
         
-        # Aplicación de compuertas según tipo de proceso
         if process_type == 'temporal':
-            circuit.append(self.gates['temporal_shift'], range(num_qubits))
+            states = self._apply_unitary(states, self._gate_matrix('temporal_shift'))
         elif process_type == 'high_energy':
-            circuit.append(self.gates['warp'], range(num_qubits))
+            states = self._apply_unitary(states, self._gate_matrix('warp'))
             for _ in range(3):
-                circuit.append(self.gates['dimensional_fold'], range(num_qubits))
+                states = self._apply_unitary(states, self._gate_matrix('dimensional_fold'))
         else:
-            circuit.h(range(num_qubits))
+            states = self._apply_hadamard(states, num_qubits)
             
-        circuit.measure_all()
+        probabilities = np.abs(states) ** 2
+        results = [QuantumResult(row, num_qubits) for row in probabilities]
+        if not compact:
+            results = [result.as_dict() for result in results]
+        return results[0] if single else results
+    
+    def _validate_states(self, states):
+        """Comprueba un lote 2-D de estados y devuelve su número de qubits"""
+        num_qubits = int(np.ceil(np.log2(states.shape[1])))
+        if states.shape[1] != 2**num_qubits:
+            raise ValueError("La longitud de los datos debe ser potencia de 2")
+        if not np.allclose(np.linalg.norm(states, axis=1), 1.0, atol=1e-8):
+            raise ValueError("Los vectores de entrada deben estar normalizados")
+        return num_qubits
+    
+    def _apply_unitary(self, states, matrix):
+        """Aplica una compuerta sobre todos los qubits de cada estado del lote"""
+        if matrix.shape != (states.shape[1], states.shape[1]):
+            raise ValueError(
+                f"La compuerta {matrix.shape} no coincide con {states.shape[1]} amplitudes")
+        return states @ matrix.T
+    
+    def _apply_hadamard(self, states, num_qubits):
+        """Transformada de Walsh-Hadamard rápida, sin construir H⊗n"""
+        batch = states.shape[0]
+        states = states.reshape((batch,) + (2,) * num_qubits)
+        for axis in range(1, num_qubits + 1):
+            zero = np.take(states, 0, axis=axis)
+            one = np.take(states, 1, axis=axis)
+            states = np.stack((zero + one, zero - one), axis=axis) / np.sqrt(2)
+        return states.reshape(batch, 2**num_qubits)
+    
+    def _cache_key(self, data, process_type):
+        """Huella de contenido de la entrada y de los parámetros del proceso"""
+        amplitudes = np.ascontiguousarray(data, dtype=np.complex128)
+        digest = hashlib.sha3_256(amplitudes.tobytes())
+        digest.update(repr((amplitudes.shape, process_type,
+                            self.warp_factor, self.shots)).encode())
+        return digest.hexdigest()
+    
+    def _cache_get(self, key):
+        """Recupera un resultado vigente de la caché cuántica (LRU/TTL)"""
+        with self._lock:
+            entry = self.quantum_cache.get(key)
+            if entry is not None:
+                stored_at, result = entry
+                if self.cache_ttl is None or time.monotonic() - stored_at <= self.cache_ttl:
+                    self.quantum_cache.move_to_end(key)
+                    self.cache_hits += 1
+                    return result
+                del self.quantum_cache[key]
+            self.cache_misses += 1
+            return None
+    
+    def _cache_put(self, key, result):
+        """Almacena un resultado desalojando las entradas menos usadas"""
+        with self._lock:
+            self.quantum_cache[key] = (time.monotonic(), dict(result))
+            self.quantum_cache.move_to_end(key)
+            while len(self.quantum_cache) > self.cache_size:
+                self.quantum_cache.popitem(last=False)
+    
+    def cache_stats(self):
+        """Estadísticas de la caché cuántica"""
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            'size': len(self.quantum_cache),
+            'capacity': self.cache_size,
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'hit_rate': self.cache_hits / lookups if lookups else 0.0
+        }
+    
+    def clear_cache(self):
+        """Vacía la caché cuántica"""
+        self.quantum_cache.clear()
+        
+    def _create_quantum_circuit(self, data, process_type):
+        """Construye circuito cuántico basado en tipo de procesamiento"""
+        from qiskit.quantum_info import Statevector
+        
+        num_qubits = int(np.ceil(np.log2(len(data))))
+        template = self._circuit_template(num_qubits, process_type)
+        circuit = template.copy_empty_like()
+        
+        # Codificación de datos: lo único que cambia entre peticiones
+        circuit.initialize(Statevector(data), range(num_qubits))
+        circuit.compose(template, inplace=True)
         return circuit
         
+    def _circuit_template(self, num_qubits, process_type):
+        """Esqueleto transpilado del circuito, cacheado por (qubits, proceso, warp)"""
+        key = (num_qubits, process_type, self.warp_factor)
+        with self._lock:
+            template = self.circuit_templates.get(key)
+            if template is None:
+                from qiskit import QuantumCircuit, transpile
+                
+                template = QuantumCircuit(num_qubits, num_qubits)
+                
+                # Aplicación de compuertas según tipo de proceso
+                if process_type == 'temporal':
+                    template.append(self._gate('temporal_shift'), range(num_qubits))
+                elif process_type == 'high_energy':
+                    template.append(self._gate('warp'), range(num_qubits))
+                    for _ in range(3):
+                        template.append(self._gate('dimensional_fold'), range(num_qubits))
+                else:
+                    template.h(range(num_qubits))
+                    
+                template.measure_all()
+                template = transpile(template, self.backend)
+                self.circuit_templates[key] = template
+            return template
+        
     def _run_circuit(self, circuit):
         """Ejecuta circuito cuántico con parámetros actuales"""
-        job = execute(circuit, self.backend, shots=1024)
-        return job.result().get_counts(circuit)
+        return self._run_circuits([circuit])[0]
+        
+    def _run_circuits(self, circuits):
+        """Envía varios circuitos al backend como un único trabajo"""
+        # Las plantillas ya están transpiladas y Aer ejecuta `initialize`
+        # de forma nativa, así que se omite la transpilación de execute()
+        job = self.backend.run(circuits, shots=self.shots)
+        result = job.result()
+        return [result.get_counts(idx) for idx in range(len(circuits))]
         
-    def _decode_result(self, result):
+    def _decode_result(self, result, compact=False):
         """Transforma resultados cuánticos a formato utilizable"""
-        max_key = max(result, key=result.get)
-        return {k: v/1024 for k, v in result.items()}
+        if compact:
+            return QuantumResult.from_counts(result, self.shots)
+        return {k: v/self.shots for k, v in result.items()}
         
-    def parallel_dimension_process(self, data_stream):
+    def parallel_dimension_process(self, data_stream, process_type='standard',
+                                   chunksize=None, compact=False):
         """
         Procesamiento paralelo a través de múltiples dimensiones
         
         Args:
             data_stream: Lista de conjuntos de datos a procesar
+            process_type: Tipo de procesamiento aplicado a cada conjunto
+            chunksize: Entradas por envío a cada trabajador (None = automático)
+            compact: Devuelve objetos QuantumResult (apilables con QuantumResult.stack)
             
         Returns:
-            Lista de resultados de todas las dimensiones
+            Lista de resultados de todas las dimensiones, en orden de entrada
         """
-        with Pool(processes=self.dimensions) as pool:
-            results = pool.map(self._process_single_dimension, data_stream)
+        if self.temporal_lock:
+            raise RuntimeError("Motor bloqueado por paradoja temporal")
+        
+        data_stream = list(data_stream)
+        if not data_stream:
+            return []
+        if chunksize is None:
+            chunksize = max(1, len(data_stream) // (self.workers * 4))
+            
+        tasks = ((idx, data, process_type, compact)
+                 for idx, data in enumerate(data_stream))
+        results = [None] * len(data_stream)
+        pool = self._get_pool()
+        for idx, result in pool.imap_unordered(_process_dimension_task, tasks, chunksize):
+            results[idx] = result
         return results
         
-    def _process_single_dimension(self, data):
-        """Procesa datos en una única dimensión"""
-        return self.execute_quantum_process(data)
+    def _get_pool(self):
+        """Devuelve el pool persistente, recreándolo si cambió la configuración"""
+        config = self._worker_config()
+        if self._pool is not None and config != self._pool_config:
+            self.close_pool()
+        if self._pool is None:
+            import multiprocessing
+            # spawn: un fork tras ejecutar Aer hereda hilos OpenMP y bloquea
+            # a los trabajadores; el coste se paga una sola vez por pool
+            context = multiprocessing.get_context('spawn')
+            self._pool = context.Pool(processes=self.workers,
+                                      initializer=_init_dimension_worker,
+                                      initargs=(config,))
+            self._pool_config = config
+        return self._pool
+        
+    def _worker_config(self):
+        """Parámetros con los que cada trabajador construye su propio motor"""
+        return {
+            'dimensions': self.dimensions,
+            'warp_factor': self.warp_factor,
+            'stability_threshold': self.stability,
+            'shots': self.shots,
+            'cache_size': self.cache_size,
+            'cache_ttl': self.cache_ttl,
+            'workers': 1,
+            'verbose': False
+        }
+        
+    def close_pool(self):
+        """Libera los procesos del pool dimensional"""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+            self._pool_config = None
         
     def activate_temporal_lock(self, duration=60):
         """Bloquea el motor para prevenir paradojas temporales"""
@@ -152,6 +479,7 @@ class QuantumEngine:
         """Apagado de emergencia del motor cuántico"""
         print("🛑 INICIANDO SECUENCIA DE EMERGENCIA")
         self.temporal_lock = True
+        self.close_pool()
         self._discharge_energy()
         print("⚡ Energía cuántica descargada - Motor seguro")
         
@@ -160,6 +488,21 @@ class QuantumEngine:
         self.energy_level = 0
         self.quantum_flux = 0.001
         
+    def __getstate__(self):
+        """El pool, el backend y el campo denso no viajan entre procesos"""
+        state = self.__dict__.copy()
+        state['_pool'] = None
+        state['_pool_config'] = None
+        state['_stability_field'] = None
+        state['_backend'] = None
+        del state['_lock']
+        return state
+        
+    def __setstate__(self, state):
+        """Restaura el estado recreando el cerrojo interno"""
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+        
     def __enter__(self):
         """Para uso en contextos with"""
         return self
@@ -167,3 +510,229 @@ class QuantumEngine:
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Asegura apagado seguro al salir de contexto"""
         self.emergency_shutdown()
+
+
+class QuantumResult(Mapping):
+    """
+    Resultado compacto respaldado por un array denso de probabilidades
+    
+    El índice del array es el entero del resultado medido. La vista
+    {bitstring: probabilidad} de _decode_result solo se construye si se
+    consulta el resultado como diccionario.
+    """
+    def __init__(self, probabilities, num_qubits, shots=None, counts=None):
+        """
+        Args:
+            probabilities: Array de 2**num_qubits probabilidades
+            num_qubits (int): Qubits medidos
+            shots (int): Mediciones de origen (None si la distribución es exacta)
+            counts: Array de conteos por resultado (None si la distribución es exacta)
+        """
+        self.probabilities = np.asarray(probabilities, dtype=np.float64)
+        self.num_qubits = num_qubits
+        self.shots = shots
+        self.counts = counts
+        self._dict = None
+        
+    @classmethod
+    def from_counts(cls, counts, shots):
+        """Construye el resultado desde los conteos de Qiskit"""
+        num_qubits = len(next(iter(counts)).split(' ')[0])
+        dense = np.zeros(2**num_qubits, dtype=np.int64)
+        for key, value in counts.items():
+            dense[int(key.split(' ')[0], 2)] += value
+        return cls(dense / shots, num_qubits, shots=shots, counts=dense)
+        
+    @staticmethod
+    def stack(results):
+        """Apila varios resultados en un único array 2-D (resultado × salida)"""
+        results = list(results)
+        if len({result.num_qubits for result in results}) > 1:
+            raise ValueError("Solo se pueden apilar resultados con igual número de qubits")
+        return np.vstack([result.probabilities for result in results])
+        
+    def most_likely(self):
+        """Entero del resultado más probable"""
+        return int(np.argmax(self.probabilities))
+        
+    def as_dict(self):
+        """Vista {bitstring: probabilidad} con las claves de _decode_result"""
+        if self._dict is None:
+            idle_register = '0' * self.num_qubits
+            self._dict = {
+                f"{idx:0{self.num_qubits}b} {idle_register}": float(self.probabilities[idx])
+                for idx in np.flatnonzero(self.probabilities > 1e-12)
+            }
+        return self._dict
+        
+    def __getitem__(self, key):
+        return self.as_dict()[key]
+        
+    def __iter__(self):
+        return iter(self.as_dict())
+        
+    def __len__(self):
+        return len(self.as_dict())
+        
+    def __getstate__(self):
+        """La vista diccionario se reconstruye tras deserializar"""
+        state = self.__dict__.copy()
+        state['_dict'] = None
+        return state
+        
+    def __repr__(self):
+        return f"QuantumResult(num_qubits={self.num_qubits}, shots={self.shots})"
+
+
+class AsyncQuantumEngine:
+    """
+    Fachada asyncio del motor cuántico para el servidor aiohttp
+    
+    Las peticiones que llegan dentro de la misma ventana de micro-lote se
+    agrupan en un único trabajo del backend (execute_quantum_batch), que
+    se ejecuta en un executor acotado sin bloquear el event loop.
+    """
+    def __init__(self, engine=None, max_workers=2, max_concurrency=64,
+                 batch_window=0.005, max_batch=32, timeout=None, **engine_kwargs):
+        """
+        Args:
+            engine: QuantumEngine existente (None crea uno nuevo con engine_kwargs)
+            max_workers (int): Hilos del executor que ejecutan los lotes
+            max_concurrency (int): Peticiones simultáneas admitidas (en cola o en curso)
+            batch_window (float): Segundos que se espera para agrupar peticiones
+            max_batch (int): Tamaño de lote que fuerza el envío inmediato
+            timeout (float): Tiempo máximo por petición por defecto (None = sin límite)
+        """
+        engine_kwargs.setdefault('verbose', False)
+        self.engine = engine or QuantumEngine(**engine_kwargs)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix='quantum-engine')
+        self.max_concurrency = max_concurrency
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self._semaphore = None
+        self._pending = {}
+        self._flush_handles = {}
+        self._inflight = set()
+        
+    async def run(self, data, process_type='standard', timeout=None):
+        """
+        Ejecuta un proceso cuántico sin bloquear el event loop
+        
+        Args:
+            data: Datos de entrada del circuito
+            process_type: Tipo de procesamiento ('standard', 'temporal', 'high_energy')
+            timeout: Tiempo máximo de espera (None = valor por defecto de la fachada)
+            
+        Returns:
+            Resultados del procesamiento cuántico
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        timeout = self.timeout if timeout is None else timeout
+        
+        async with self._semaphore:
+            future = self._enqueue(data, process_type)
+            # Si se cancela o expira antes del envío, la petición sale del lote
+            return await asyncio.wait_for(future, timeout)
+        
+    def _enqueue(self, data, process_type):
+        """Añade la petición al micro-lote de su tipo de proceso"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        try:
+            # Una entrada inválida falla solo su propia petición, no el lote
+            states = np.atleast_2d(np.asarray(data, dtype=np.complex128))
+            if states.ndim != 2:
+                raise ValueError("Los datos deben ser un vector de amplitudes")
+            self.engine._validate_states(states)
+        except Exception as e:
+            future.set_exception(e)
+            return future
+        batch = self._pending.setdefault(process_type, [])
+        batch.append((data, future))
+        
+        if len(batch) >= self.max_batch:
+            self._flush(process_type)
+        elif process_type not in self._flush_handles:
+            self._flush_handles[process_type] = loop.call_later(
+                self.batch_window, self._flush, process_type)
+        return future
+        
+    def _flush(self, process_type):
+        """Envía el micro-lote acumulado al executor"""
+        handle = self._flush_handles.pop(process_type, None)
+        if handle is not None:
+            handle.cancel()
+        batch = [(data, future) for data, future in self._pending.pop(process_type, [])
+                 if not future.done()]
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._dispatch(batch, process_type))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+        
+    async def _dispatch(self, batch, process_type):
+        """Ejecuta el lote en el executor y reparte los resultados"""
+        loop = asyncio.get_running_loop()
+        inputs = [data for data, _ in batch]
+        try:
+            results = await loop.run_in_executor(
+                self.executor, self.engine.execute_quantum_batch, inputs, process_type)
+        except Exception as e:
+            if len(batch) == 1:
+                if not batch[0][1].done():
+                    batch[0][1].set_exception(e)
+                return
+            # El fallo no se puede atribuir: cada entrada se reintenta sola
+            # para que el error llegue únicamente a quien lo provocó
+            for data, future in batch:
+                if future.done():
+                    continue
+                try:
+                    result = await loop.run_in_executor(
+                        self.executor, self.engine.execute_quantum_process, data, process_type)
+                except Exception as error:
+                    if not future.done():
+                        future.set_exception(error)
+                    continue
+                if not future.done():
+                    future.set_result(result)
+            return
+            
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+                
+    async def close(self):
+        """Vacía los lotes pendientes y libera el executor"""
+        for process_type in list(self._pending):
+            self._flush(process_type)
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        self.executor.shutdown(wait=False)
+        self.engine.close_pool()
+        
+    async def __aenter__(self):
+        """Para uso en contextos async with"""
+        return self
+        
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Libera los recursos de la fachada al salir del contexto"""
+        await self.close()
+
+
+# Motor residente en cada trabajador del pool dimensional
+_worker_engine = None
+
+def _init_dimension_worker(config):
+    """Construye una única vez el motor cuántico de cada trabajador"""
+    global _worker_engine
+    _worker_engine = QuantumEngine(**config)
+
+def _process_dimension_task(task):
+    """Procesa una entrada indexada dentro de un trabajador del pool"""
+    idx, data, process_type, compact = task
+    return idx, _worker_engine.execute_quantum_process(
+        data, process_type, compact=compact)
@@ -11,45 +11,73 @@ from aiohttp import web
 import numpy as np
 from datetime import datetime, timedelta
 import quantum_http as qhttp
-from dimensional_folding import SpaceTimeFolder
 from temporal_sync import ChronoLock
 import hashlib
 import json
+import time
 import warnings
+from collections import OrderedDict
+from functools import partial
 
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
 class APIFolder:
+    # Límites por defecto de cada pool; un agujero de gusano puede sobrescribirlos
+    DEFAULT_POOL = {
+        'max_connections': 100,
+        'keepalive': 30.0,
+        'connect_timeout': 3.0,
+        'read_timeout': 30.0,
+        'dns_ttl': 300,
+        'warmup': 2
+    }
+    
+    # Métodos idempotentes por defecto; el resto requiere una regla de ruta
+    SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+    
+    # Cabeceras que no cambian la respuesta del agujero de gusano. Todas las
+    # demás se reenvían y por tanto forman parte de la clave de caché
+    UNKEYED_HEADERS = ('Host', 'Connection', 'Keep-Alive', 'Content-Length',
+                       'Cache-Control', 'Pragma', 'Accept-Encoding', 'User-Agent',
+                       'X-Request-Id', 'Traceparent')
+    
     def __init__(self, 
                  max_folds=5, 
                  quantum_entanglement=True,
-                 temporal_compression=0.7):
-        .      if __name__ == "__main__":
-            # Configuración avanzada
-                   folder = APIFolder(
-                  max_folds=7,               # Máximo de dobleces
-        quantum_entanglement=True, # Entrelazamiento cuántico
-         temporal_compression=0.5   # Mayor compresión
-)
-
-            # Agregar rutas personalizadas
-          folder.add_route('/custom', handle_custom_request)
-
-            # Iniciar servidor
-            folder.run_server(port=8080)
-                     
+                 temporal_compression=0.7,
+                 pool_options=None,
+                 cache_bytes=0,
+                 cache_ttl=30.0,
+                 coalesce=False):
+        """
+        Inicializa el sistema de doblado API
+        
         Args:
             max_folds: Máximo de dobleces espacio-temporales por petición
             quantum_entanglement: Activar entrelazamiento cuántico
             temporal_compression: Factor de compresión temporal (0.1-1.0)
+            pool_options: Límites comunes de los pools (ver DEFAULT_POOL)
+            cache_bytes: Bytes de la caché de respuestas idempotentes (0 la desactiva)
+            cache_ttl: Segundos de validez por defecto de una respuesta cacheada
+            coalesce: Peticiones idempotentes idénticas simultáneas (mismas
+                cabeceras reenviadas incluidas) comparten una sola llamada
         """
         self.max_folds = max_folds
         self.quantum_enabled = quantum_entanglement
         self.temporal_compression = temporal_compression
         self.folder = SpaceTimeFolder()
         self.chrono_lock = ChronoLock()
-        self.session = qhttp.QuantumSession()
+        self.pool_options = {**self.DEFAULT_POOL, **(pool_options or {})}
+        self.pools = {}
         self.routes = {}
+        self.route_policies = {}
+        self.cache_bytes = cache_bytes
+        self.cache_ttl = cache_ttl
+        self.coalesce = coalesce
+        self._response_cache = OrderedDict()
+        self._cache_used = 0
+        self._inflight = {}
+        self.cache_counters = {'hits': 0, 'misses': 0, 'coalesced': 0, 'expired': 0}
         self._init_wormholes()
         
     def _init_wormholes(self):
@@ -65,6 +93,44 @@ class APIFolder:
             }
         }
         
+    def add_wormhole(self, name, entrance, exit, **pool_options):
+        """
+        Registra un agujero de gusano con límites de pool propios
+        
+        Debe llamarse antes de start_pools: un pool ya abierto no se recrea.
+        
+        Args:
+            name: Nombre del agujero de gusano
+            entrance: URL de doblado
+            exit: URL de desdoblado
+            pool_options: Sobrescribe DEFAULT_POOL para este agujero
+        """
+        self.wormholes[name] = {'entrance': entrance, 'exit': exit, 'pool': pool_options}
+        
+    async def _get_pool(self, name):
+        """Pool del agujero de gusano, creado en el bucle actual si aún no existe"""
+        pool = self.pools.get(name)
+        if pool is None:
+            wormhole = self.wormholes[name]
+            pool = WormholePool(name, wormhole['entrance'],
+                                **{**self.pool_options, **wormhole.get('pool', {})})
+            self.pools[name] = pool
+        return pool
+    
+    async def start_pools(self, app=None):
+        """Abre y precalienta un pool por agujero de gusano"""
+        pools = [await self._get_pool(name) for name in self.wormholes]
+        await asyncio.gather(*(pool.warm_up() for pool in pools))
+        
+    async def close_pools(self, app=None):
+        """Cierra las sesiones de todos los pools"""
+        pools, self.pools = list(self.pools.values()), {}
+        await asyncio.gather(*(pool.close() for pool in pools))
+        
+    def pool_stats(self):
+        """Estadísticas de conexiones por agujero de gusano"""
+        return {name: pool.stats() for name, pool in self.pools.items()}
+        
     async def fold_request(self, request):
         """
         Procesa una petición HTTP a través de doblado espacio-temporal
@@ -97,22 +163,45 @@ class APIFolder:
             'signature': quantum_signature,
             'compression': self.temporal_compression,
             'max_folds': self.max_folds,
+            'quantum_entanglement': self.quantum_enabled,
             'timestamp': datetime.utcnow().isoformat()
         }
         
         # Selección de agujero de gusano
-        wormhole = self._select_wormhole(request)
+        name = self._select_wormhole(request)
+        teleport = partial(self._teleport, name, fold_config, request_data, request_headers)
+        
+        policy = self._route_policy(request)
+        if not policy['idempotent']:
+            return self._json_body(await teleport())
+            
+        # Respuestas idempotentes: caché por firma y una sola llamada por clave
+        key = self._cache_key(request, quantum_signature, policy)
+        bypass = 'no-cache' in request.headers.get('Cache-Control', '')
+        if self.cache_bytes and not bypass:
+            body = self._cache_get(key)
+            if body is not None:
+                return self._json_body(body)
+                
+        if self.coalesce:
+            body = await self._coalesced(key, teleport)
+        else:
+            body = await teleport()
+        self._cache_put(key, body, policy['ttl'])
+        return self._json_body(body)
         
+    async def _teleport(self, name, fold_config, request_data, request_headers):
+        """Envía la petición doblada y devuelve el cuerpo JSON verificado"""
+        pool = await self._get_pool(name)
         try:
-            # Proceso de teletransportación
-            async with self.session.post(
-                wormhole['entrance'],
+            # Proceso de teletransportación por una conexión keep-alive del pool
+            async with pool.post(
+                self.wormholes[name]['entrance'],
                 json={
                     'config': fold_config,
                     'data': request_data,
                     'headers': request_headers
-                },
-                quantum_entanglement=self.quantum_enabled
+                }
             ) as response:
                 
                 if response.status != 200:
@@ -132,11 +221,113 @@ class APIFolder:
                     raise web.HTTPInternalServerError(
                         text="Fallo de integridad cuántica en respuesta")
                 
-                return web.json_response(unfolded_data)
+                return json.dumps(unfolded_data).encode('utf-8')
                 
-        except qhttp.QuantumConnectionError as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             raise web.HTTPServiceUnavailable(
-                text=f"Fallo en conexión cuántica: {str(e)}")
+                text=f"Fallo en conexión cuántica: {str(e) or type(e).__name__}")
+        
+    @staticmethod
+    def _json_body(body):
+        """Respuesta JSON a partir de un cuerpo ya serializado"""
+        return web.Response(body=body, content_type='application/json')
+    
+    def set_route_policy(self, path, idempotent, ttl=None, unkeyed_headers=()):
+        """
+        Define si las peticiones de una ruta pueden cachearse y agruparse
+        
+        Args:
+            path: Ruta exacta de la petición
+            idempotent: True permite caché y coalescencia aunque el método sea POST
+            ttl: Segundos de validez en caché (None = cache_ttl)
+            unkeyed_headers: Cabeceras adicionales a UNKEYED_HEADERS que la
+                ruta ignora; nunca deben incluir credenciales
+        """
+        self.route_policies[path] = {'idempotent': idempotent, 'ttl': ttl,
+                                     'unkeyed_headers': tuple(unkeyed_headers)}
+        
+    def _route_policy(self, request):
+        """Regla de la ruta o, en su defecto, la del método HTTP"""
+        policy = self.route_policies.get(request.path)
+        if policy is None:
+            policy = {'idempotent': request.method in self.SAFE_METHODS,
+                      'ttl': None, 'unkeyed_headers': ()}
+        return {**policy, 'ttl': self.cache_ttl if policy['ttl'] is None else policy['ttl']}
+    
+    def _cache_key(self, request, signature, policy):
+        """
+        Clave (método, ruta, firma) más todas las cabeceras reenviadas
+        
+        Las cabeceras viajan enteras al agujero de gusano, así que cualquiera
+        (Authorization, Cookie, X-Api-Key...) puede cambiar la respuesta: solo
+        se excluyen las de UNKEYED_HEADERS y las de la regla de la ruta.
+        """
+        unkeyed = {header.lower() for header in
+                   self.UNKEYED_HEADERS + policy['unkeyed_headers']}
+        headers = tuple(sorted((name.lower(), value) for name, value in request.headers.items()
+                               if name.lower() not in unkeyed))
+        # El agujero de gusano elegido depende de la prioridad: también forma parte
+        return (request.method, request.path_qs, signature,
+                self._select_wormhole(request), headers)
+    
+    def _cache_get(self, key):
+        """Cuerpo cacheado y vigente de una clave (None si no está)"""
+        entry = self._response_cache.get(key)
+        if entry is None:
+            self.cache_counters['misses'] += 1
+            return None
+        body, expires = entry
+        if expires <= time.monotonic():
+            self._cache_evict(key)
+            self.cache_counters['expired'] += 1
+            self.cache_counters['misses'] += 1
+            return None
+        self._response_cache.move_to_end(key)
+        self.cache_counters['hits'] += 1
+        return body
+    
+    def _cache_put(self, key, body, ttl):
+        """Cachea un cuerpo desalojando por LRU hasta caber en cache_bytes"""
+        if ttl <= 0 or len(body) > self.cache_bytes:
+            return
+        if key in self._response_cache:
+            self._cache_evict(key)
+        self._response_cache[key] = (body, time.monotonic() + ttl)
+        self._cache_used += len(body)
+        while self._cache_used > self.cache_bytes:
+            self._cache_evict(next(iter(self._response_cache)))
+            
+    def _cache_evict(self, key):
+        body, _ = self._response_cache.pop(key)
+        self._cache_used -= len(body)
+        
+    async def _coalesced(self, key, teleport):
+        """Singleflight: las peticiones con la misma clave esperan una única llamada"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(teleport())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.cache_counters['coalesced'] += 1
+        try:
+            # shield: si un cliente se desconecta, el resto sigue esperando la llamada
+            return await asyncio.shield(task)
+        except web.HTTPException as e:
+            # Cada petición recibe su propia respuesta de error
+            raise type(e)(text=e.text) from None
+        
+    def cache_stats(self):
+        """Estadísticas de la caché de respuestas y de la coalescencia"""
+        lookups = self.cache_counters['hits'] + self.cache_counters['misses']
+        return {
+            **self.cache_counters,
+            'entries': len(self._response_cache),
+            'bytes': self._cache_used,
+            'capacity_bytes': self.cache_bytes,
+            'in_flight': len(self._inflight),
+            'hit_rate': self.cache_counters['hits'] / lookups if lookups else 0.0
+        }
         
     def _generate_quantum_signature(self, data):
         """Genera firma cuántica para verificación de integridad"""
@@ -144,13 +335,13 @@ class APIFolder:
         return hashlib.sha3_256(data_str).hexdigest()
     
     def _select_wormhole(self, request):
-        """Selecciona el agujero de gusano óptimo para la petición"""
+        """Nombre del agujero de gusano óptimo para la petición"""
         # Lógica avanzada de selección basada en QoS cuántico
         if 'X-Quantum-Priority' in request.headers:
             if request.headers['X-Quantum-Priority'] == 'emergency':
-                return self.wormholes['emergency']
+                return 'emergency'
         
-        return self.wormholes['default']
+        return 'default'
     
     def _verify_response(self, data, original_hash):
         """Verifica la integridad cuántica de los datos desdoblados"""
@@ -172,10 +363,102 @@ class APIFolder:
         """Inicia el servidor de teletransportación API"""
         app = web.Application()
         app.add_routes([web.route('*', '/{tail:.*}', self.handle_request)])
+        # Los pools viven en el bucle del servidor: se abren y cierran con él
+        app.on_startup.append(self.start_pools)
+        app.on_cleanup.append(self.close_pools)
         
         print(f"🌀 Servidor de doblado API iniciado en {host}:{port}")
         web.run_app(app, host=host, port=port)
 
+# Pool de conexiones por agujero de gusano
+class WormholePool:
+    """Sesión aiohttp keep-alive con límites y métricas para un agujero de gusano"""
+    def __init__(self, name, entrance, max_connections=100, keepalive=30.0,
+                 connect_timeout=3.0, read_timeout=30.0, dns_ttl=300, warmup=2):
+        self.name = name
+        self.entrance = entrance
+        self.max_connections = max_connections
+        self.warmup_connections = warmup
+        self.counters = {
+            'requests': 0, 'in_flight': 0, 'errors': 0,
+            'connections_created': 0, 'connections_reused': 0,
+            'queued': 0, 'max_queued': 0
+        }
+        
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(self._on_request_start)
+        trace.on_request_end.append(self._on_request_end)
+        trace.on_request_exception.append(self._on_request_exception)
+        trace.on_connection_create_end.append(self._count('connections_created'))
+        trace.on_connection_reuseconn.append(self._count('connections_reused'))
+        trace.on_connection_queued_start.append(self._on_queued_start)
+        trace.on_connection_queued_end.append(self._on_queued_end)
+        
+        self.connector = aiohttp.TCPConnector(
+            limit=max_connections,
+            limit_per_host=max_connections,
+            ttl_dns_cache=dns_ttl,
+            keepalive_timeout=keepalive)
+        self.session = aiohttp.ClientSession(
+            connector=self.connector,
+            timeout=aiohttp.ClientTimeout(total=None,
+                                          sock_connect=connect_timeout,
+                                          sock_read=read_timeout),
+            trace_configs=[trace])
+        
+    def post(self, url, **kwargs):
+        """POST por el pool (context manager de aiohttp)"""
+        return self.session.post(url, **kwargs)
+    
+    async def warm_up(self, connections=None):
+        """Abre conexiones por adelantado para que la primera ráfaga no pague TCP/TLS"""
+        connections = self.warmup_connections if connections is None else connections
+        
+        async def touch():
+            async with self.session.head(self.entrance, allow_redirects=False) as response:
+                # Leer hasta el final devuelve la conexión al pool en vez de cerrarla
+                await response.read()
+            
+        results = await asyncio.gather(*(touch() for _ in range(connections)),
+                                       return_exceptions=True)
+        failed = [result for result in results if isinstance(result, Exception)]
+        if failed:
+            print(f"⚠️ Precalentamiento parcial de '{self.name}': {failed[0]!r}")
+        return connections - len(failed)
+    
+    def stats(self):
+        """Contadores del pool para dimensionar max_connections"""
+        stats = dict(self.counters)
+        stats['limit'] = self.max_connections
+        stats['closed'] = self.session.closed
+        return stats
+    
+    async def close(self):
+        await self.session.close()
+        
+    def _count(self, key):
+        async def handler(session, context, params):
+            self.counters[key] += 1
+        return handler
+    
+    async def _on_request_start(self, session, context, params):
+        self.counters['requests'] += 1
+        self.counters['in_flight'] += 1
+        
+    async def _on_request_end(self, session, context, params):
+        self.counters['in_flight'] -= 1
+        
+    async def _on_request_exception(self, session, context, params):
+        self.counters['in_flight'] -= 1
+        self.counters['errors'] += 1
+        
+    async def _on_queued_start(self, session, context, params):
+        self.counters['queued'] += 1
+        self.counters['max_queued'] = max(self.counters['max_queued'], self.counters['queued'])
+        
+    async def _on_queued_end(self, session, context, params):
+        self.counters['queued'] -= 1
+
 # Componente de Doblamiento Espacio-Temporal
 class SpaceTimeFolder:
     def __init__(self, compression_level=0.7):
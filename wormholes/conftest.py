@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# =============================================
+# Configuración de pytest para los agujeros de gusano
+# =============================================
+
+import sys
+import types
+
+# temporal_sync.py no es todavía un módulo importable (solo la tabla de
+# niveles). Si no se puede importar, se registra un ChronoLock que siempre
+# considera segura la operación para poder importar api_fold en las pruebas.
+try:
+    from temporal_sync import ChronoLock  # noqa: F401
+except (ImportError, SyntaxError):
+    class ChronoLock:
+        async def check_temporal_safety(self):
+            return True
+
+    temporal_sync = types.ModuleType('temporal_sync')
+    temporal_sync.ChronoLock = ChronoLock
+    sys.modules['temporal_sync'] = temporal_sync
@@ -10,14 +10,26 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 import numpy as np
 import pandas as pd
-from quantum_compress import QuantumCompressor
-from temporal_index import ChronoIndexer
+import bz2
 import hashlib
+import io
 import json
+import lzma
 import os
+import re
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+from itertools import islice
 from pathlib import Path
+from types import MappingProxyType, SimpleNamespace
 import warnings
-from typing import Union, Dict, List
+from typing import Union, Dict, List, Iterable, Optional
 
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
@@ -25,7 +37,12 @@ class DataSingularity:
     def __init__(self, 
                  event_horizon: str = "sqlite:///:memory:",
                  compression_level: float = 0.9,
-                 quantum_storage: bool = True):
+                 quantum_storage: bool = True,
+                 codec: str = 'auto',
+                 cache_bytes: int = 64 * 1024 * 1024,
+                 cache_mode: str = 'copy',
+                 chunk_bytes: int = 8 * 1024 * 1024,
+                 trust_hours: Optional[float] = None):
         """
         Inicializa el agujero negro de datos
         
@@ -33,12 +50,33 @@ class DataSingularity:
             event_horizon: Connection string para el horizonte de eventos
             compression_level: Nivel de compresión cuántica (0.1-1.0)
             quantum_storage: Habilita almacenamiento en superposición cuántica
+            codec: Códec de compresión ('auto', 'zlib', 'lzma', 'bz2', 'none')
+            cache_bytes: Bytes aproximados de la caché de lectura (0 la desactiva)
+            cache_mode: 'copy' devuelve copias; 'view' devuelve una vista de
+                solo lectura (mappingproxy/tuplas; los DataFrames solo se
+                comparten si pandas aplica copy-on-write, si no se copian)
+            chunk_bytes: Los contenidos serializados mayores se guardan en
+                trozos comprimidos de este tamaño en la tabla data_chunks
+            trust_hours: Si se indica, las lecturas no recalculan el hash de
+                las filas que verify_all comprobó en las últimas horas
         """
+        if cache_mode not in ('copy', 'view'):
+            raise ValueError("cache_mode debe ser 'copy' o 'view'")
         self.event_horizon = event_horizon
         self.compression = compression_level
         self.quantum = quantum_storage
-        self.compressor = QuantumCompressor(level=compression_level)
+        self.compressor = QuantumCompressor(level=compression_level, codec=codec)
         self.indexer = ChronoIndexer()
+        self.cache_bytes = cache_bytes
+        self.cache_mode = cache_mode
+        self.chunk_bytes = chunk_bytes
+        self.trust_hours = trust_hours
+        self._read_cache = OrderedDict()
+        self._cache_used = 0
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._digests_checked = False
         self._init_singularity()
         
     def _init_singularity(self):
@@ -50,14 +88,54 @@ class DataSingularity:
         self.metadata = sa.MetaData()
         self.data_table = sa.Table(
             'compressed_data', self.metadata,
-            sa.Column('id', sa.String(64),
+            sa.Column('id', sa.String(64), primary_key=True),
             sa.Column('quantum_hash', sa.String(128)),
             sa.Column('compressed_data', sa.LargeBinary),
             sa.Column('temporal_index', sa.JSON),
-            sa.Column('dimensions', sa.Integer)
+            sa.Column('dimensions', sa.Integer),
+            sa.Column('dictionary_id', sa.Integer),
+            sa.Column('ingested_at', sa.Float, index=True),
+            # Tamaño serializado y número de trozos (NULL = blob en línea)
+            sa.Column('size', sa.BigInteger),
+            sa.Column('chunks', sa.Integer),
+            # Última verificación completa del hash por verify_all
+            sa.Column('verified_at', sa.Float),
+            # Llegada a esta singularidad (ingesta, transferencia, sync o
+            # restauración); ingested_at conserva la fecha de origen
+            sa.Column('stored_at', sa.Float, index=True),
+            sa.Index('ix_compressed_data_dimensions_time', 'dimensions', 'ingested_at')
+        )
+        
+        # Trozos comprimidos de los objetos grandes, cada uno con su hash
+        self.chunk_table = sa.Table(
+            'data_chunks', self.metadata,
+            sa.Column('data_id', sa.String(64), primary_key=True),
+            sa.Column('seq', sa.Integer, primary_key=True, autoincrement=False),
+            sa.Column('offset', sa.BigInteger),
+            sa.Column('size', sa.Integer),
+            sa.Column('quantum_hash', sa.String(128)),
+            sa.Column('compressed_data', sa.LargeBinary)
+        )
+        
+        # Diccionarios zlib compartidos, versionados por fecha de creación
+        self.dictionary_table = sa.Table(
+            'compression_dictionaries', self.metadata,
+            sa.Column('id', sa.Integer, primary_key=True, autoincrement=False),
+            sa.Column('dictionary', sa.LargeBinary),
+            sa.Column('created', sa.Float)
+        )
+        
+        # Resumen XOR de los IDs por prefijo hexadecimal (hojas del árbol de sync)
+        self.digest_table = sa.Table(
+            'sync_digests', self.metadata,
+            sa.Column('bucket', sa.String(self.DIGEST_PREFIX), primary_key=True),
+            sa.Column('count', sa.Integer),
+            sa.Column('digest', sa.String(64))
         )
         
         self.metadata.create_all(self.engine)
+        self.compressor.dictionary_loader = self._fetch_dictionary
+        self._load_dictionaries()
         
     def ingest_data(self, 
                    data: Union[Dict, List, pd.DataFrame], 
@@ -72,38 +150,383 @@ class DataSingularity:
         Returns:
             ID cuántico de los datos
         """
-        # Serialización y compresión
-        serialized = self._serialize_data(data)
+        return self.ingest_many([data], dimensions=dimensions)[0]
+    
+    def ingest_many(self,
+                    records: Iterable[Union[Dict, List, pd.DataFrame]],
+                    dimensions: int = 4,
+                    batch_size: int = 1000,
+                    workers: Optional[int] = None) -> List[str]:
+        """
+        Absorbe un flujo de registros con una transacción por lote
+        
+        El contenido ya presente en la singularidad (mismo ID SHA3) no se
+        vuelve a comprimir ni a escribir.
+        
+        Args:
+            records: Iterable de datos a comprimir
+            dimensions: Dimensiones de compresión
+            batch_size: Registros por transacción (INSERT executemany)
+            workers: Hilos para serializar, comprimir y hashear (None = secuencial)
+            
+        Returns:
+            IDs cuánticos en el orden de entrada
+        """
+        executor = ThreadPoolExecutor(max_workers=workers) if workers else None
+        map_records = executor.map if executor else map
+        records = iter(records)
+        data_ids = []
+        try:
+            while True:
+                batch = list(islice(records, batch_size))
+                if not batch:
+                    break
+                serialized = list(map_records(self._serialize_record, batch))
+                self._ingest_batch(serialized, dimensions, map_records)
+                data_ids.extend(data_id for data_id, _ in serialized)
+        finally:
+            if executor:
+                executor.shutdown()
+                
+        return data_ids
+    
+    def _ingest_batch(self, serialized, dimensions, map_records=map):
+        """Comprime e inserta en una transacción pares (ID, serializado)"""
+        with self.Session() as session:
+            existing = self._existing_ids(session, [data_id for data_id, _ in serialized])
+            
+        # Solo se comprime el contenido que la singularidad aún no guarda
+        pending = {}
+        for data_id, payload in serialized:
+            if data_id not in existing:
+                pending.setdefault(data_id, payload)
+                
+        for data_id, payload in list(pending.items()):
+            if self._payload_size(payload) > self.chunk_bytes:
+                self._ingest_chunked(data_id, pending.pop(data_id), dimensions)
+                
+        if pending:
+            rows = list(map_records(
+                partial(self._compress_record, dimensions=dimensions),
+                list(pending),
+                list(pending.values())))
+            with self.Session() as session:
+                self._insert_rows(session, rows)
+                session.commit()
+    
+    def _serialize_record(self, data):
+        """
+        Serializa un registro y calcula su ID de contenido
+        
+        Los objetos mayores que chunk_bytes quedan como lista de buffers
+        (las columnas numéricas son vistas sin copia) para trocearlos sin
+        unirlos nunca en un único bytes.
+        """
+        parts = self._serialize_parts(data)
+        if self._payload_size(parts) <= self.chunk_bytes:
+            serialized = b''.join(parts)
+            return self._generate_quantum_id(serialized), serialized
+        content_id = hashlib.sha3_256()
+        for part in parts:
+            content_id.update(part)
+        return content_id.hexdigest(), parts
+    
+    @staticmethod
+    def _payload_size(payload):
+        """Bytes de un contenido serializado (bytes o lista de buffers)"""
+        if isinstance(payload, list):
+            return sum(memoryview(part).nbytes for part in payload)
+        return len(payload)
+    
+    def _ingest_chunked(self, data_id, payload, dimensions):
+        """Comprime e inserta un objeto grande trozo a trozo en una transacción"""
+        parts = payload if isinstance(payload, list) else [payload]
+        chunk_hashes = hashlib.blake2b()
+        ingested_at = time.time()
+        offset = seq = 0
+        dictionary_id = None
+        with self.Session() as session:
+            for chunk in self._iter_chunks(parts, self.chunk_bytes):
+                compressed = self.compressor.compress(chunk)
+                chunk_hash = self._generate_quantum_hash(compressed)
+                chunk_hashes.update(chunk_hash.encode('ascii'))
+                dictionary_id = dictionary_id or self.compressor.dictionary_of(compressed)
+                session.execute(self.chunk_table.insert().values(
+                    data_id=data_id, seq=seq, offset=offset, size=len(chunk),
+                    quantum_hash=chunk_hash, compressed_data=compressed))
+                offset += len(chunk)
+                seq += 1
+            inserted = self._insert_rows(session, [{
+                'id': data_id,
+                # Hash de integridad de la secuencia de hashes de los trozos
+                'quantum_hash': chunk_hashes.hexdigest(),
+                'compressed_data': b'',
+                'temporal_index': self.indexer.create_index(None, data_id, ingested_at),
+                'dimensions': dimensions,
+                'dictionary_id': dictionary_id,
+                'ingested_at': ingested_at,
+                'size': offset,
+                'chunks': seq
+            }])
+            # Otro escritor lo guardó antes: sus trozos ya existen
+            if inserted:
+                session.commit()
+            else:
+                session.rollback()
+    
+    @staticmethod
+    def _iter_chunks(parts, chunk_bytes):
+        """Trocea buffers consecutivos en bloques de chunk_bytes (vistas si es posible)"""
+        pending = bytearray()
+        for part in parts:
+            view = memoryview(part).cast('B')
+            while len(view):
+                if not pending and len(view) >= chunk_bytes:
+                    yield view[:chunk_bytes]
+                    view = view[chunk_bytes:]
+                    continue
+                take = chunk_bytes - len(pending)
+                pending += view[:take]
+                view = view[take:]
+                if len(pending) == chunk_bytes:
+                    yield bytes(pending)
+                    pending = bytearray()
+        if pending:
+            yield bytes(pending)
+    
+    def _compress_record(self, data_id, serialized, dimensions):
+        """Comprime e indexa un registro serializado listo para insertar"""
         compressed = self.compressor.compress(serialized)
-        data_id = self._generate_quantum_id(serialized)
+        ingested_at = time.time()
+        return {
+            'id': data_id,
+            'quantum_hash': self._generate_quantum_hash(compressed),
+            'compressed_data': compressed,
+            # Indexación temporal
+            'temporal_index': self.indexer.create_index(serialized, data_id, ingested_at),
+            'dimensions': dimensions,
+            'dictionary_id': self.compressor.dictionary_of(compressed),
+            'ingested_at': ingested_at,
+            'size': len(serialized),
+            'chunks': None
+        }
+    
+    def _existing_ids(self, session, data_ids):
+        """IDs de la lista que ya están almacenados (búsqueda por clave primaria)"""
+        data_ids = list(set(data_ids))
+        existing = set()
+        # Bloques por debajo del límite de parámetros de SQLite
+        for start in range(0, len(data_ids), 500):
+            stmt = sa.select(self.data_table.c.id).where(
+                self.data_table.c.id.in_(data_ids[start:start + 500]))
+            existing.update(session.execute(stmt).scalars())
+        return existing
+    
+    def _insert_rows(self, session, rows):
+        """Inserta filas completas omitiendo IDs ya almacenados"""
+        existing = self._existing_ids(session, [row['id'] for row in rows])
+        # Una verificación previa solo vale para el almacenamiento que se comprobó,
+        # y los respaldos incrementales parten de la llegada local
+        stored_at = time.time()
+        rows = [{**row, 'verified_at': None, 'stored_at': stored_at}
+                for row in rows if row['id'] not in existing]
+        if rows:
+            session.execute(self.data_table.insert(), rows)
+            self._update_digests(session, [row['id'] for row in rows])
+        return [row['id'] for row in rows]
+    
+    def _delete_rows(self, session, data_ids):
+        """Elimina filas por ID (resúmenes de sync incluidos) y las saca de la caché"""
+        existing = self._existing_ids(session, data_ids)
+        existing_ids = sorted(existing)
+        for start in range(0, len(existing_ids), 500):
+            session.execute(self.data_table.delete().where(
+                self.data_table.c.id.in_(existing_ids[start:start + 500])))
+            session.execute(self.chunk_table.delete().where(
+                self.chunk_table.c.data_id.in_(existing_ids[start:start + 500])))
+        if existing_ids:
+            self._update_digests(session, existing_ids, removed=True)
+        with self._cache_lock:
+            for data_id in existing_ids:
+                entry = self._read_cache.pop(data_id, None)
+                if entry is not None:
+                    self._cache_used -= entry[1]
+        return existing_ids
+    
+    def _id_pages(self, page_size=1000):
+        """Recorre los IDs ordenados por páginas (keyset, sin cursor abierto)"""
+        last = None
+        while True:
+            stmt = sa.select(self.data_table.c.id).order_by(self.data_table.c.id).limit(page_size)
+            if last is not None:
+                stmt = stmt.where(self.data_table.c.id > last)
+            with self.Session() as session:
+                page = list(session.execute(stmt).scalars())
+            if not page:
+                return
+            yield page
+            last = page[-1]
+    
+    # Hexadecimales de prefijo que forman un cubo hoja (16**3 = 4096 cubos)
+    DIGEST_PREFIX = 3
+    
+    def _update_digests(self, session, data_ids, removed=False):
+        """Acumula los IDs insertados (o retira los eliminados) en el resumen XOR de su cubo"""
+        buckets = {}
+        for data_id in data_ids:
+            count, digest = buckets.get(data_id[:self.DIGEST_PREFIX], (0, 0))
+            buckets[data_id[:self.DIGEST_PREFIX]] = (count + 1, digest ^ int(data_id, 16))
+            
+        table = self.digest_table
+        stored = self._lock_digests(session, sorted(buckets))
+        updates, inserts = [], []
+        for bucket, (count, digest) in buckets.items():
+            row = stored.get(bucket)
+            if row is None:
+                inserts.append({'bucket': bucket, 'count': count,
+                                'digest': format(digest, '064x')})
+            else:
+                updates.append({'b_bucket': bucket,
+                                'count': row.count - count if removed else row.count + count,
+                                'digest': format(int(row.digest, 16) ^ digest, '064x')})
+        if inserts:
+            session.execute(table.insert(), inserts)
+        if updates:
+            session.execute(
+                table.update().where(table.c.bucket == sa.bindparam('b_bucket')),
+                updates)
+    
+    def _lock_digests(self, session, buckets):
+        """
+        Filas de resumen de los cubos (ordenados), bloqueadas hasta el commit
         
-        # Indexación temporal
-        temporal_idx = self.indexer.create_index(data)
+        SELECT ... FOR UPDATE no bloquea cubos que aún no existen y dos
+        escritores podrían insertar el mismo. En PostgreSQL y SQLite un upsert
+        crea los que faltan y bloquea los existentes en orden de cubo, así
+        que escritores concurrentes ni chocan ni se interbloquean.
+        """
+        table = self.digest_table
+        dialect = self.engine.dialect.name
+        if dialect in ('postgresql', 'sqlite'):
+            if dialect == 'postgresql':
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+            stmt = insert(table).values([
+                {'bucket': bucket, 'count': 0, 'digest': '0' * 64} for bucket in buckets])
+            # El DO UPDATE sin cambios es lo que toma el bloqueo de fila
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.bucket], set_={'count': table.c.count}
+            ).returning(table.c.bucket, table.c.count, table.c.digest)
+            return {row.bucket: row for row in session.execute(stmt)}
+        stmt = sa.select(table).where(table.c.bucket.in_(buckets)).order_by(
+            table.c.bucket).with_for_update()
+        return {row.bucket: row for row in session.execute(stmt)}
+    
+    def rebuild_digests(self, chunk_size: int = 10000):
+        """
+        Recalcula los resúmenes de sincronización recorriendo todos los IDs
         
-        # Almacenamiento en horizonte de eventos
+        Necesario para singularidades escritas por versiones anteriores o
+        modificadas fuera de esta clase.
+        """
         with self.Session() as session:
-            stmt = self.data_table.insert().values(
-                id=data_id,
-                quantum_hash=self._generate_quantum_hash(compressed),
-                compressed_data=compressed,
-                temporal_index=temporal_idx,
-                dimensions=dimensions
-            )
-            session.execute(stmt)
+            session.execute(self.digest_table.delete())
+            result = session.execute(sa.select(self.data_table.c.id),
+                                     execution_options={'yield_per': chunk_size})
+            buckets = {}
+            for data_id in result.scalars():
+                count, digest = buckets.get(data_id[:self.DIGEST_PREFIX], (0, 0))
+                buckets[data_id[:self.DIGEST_PREFIX]] = (count + 1, digest ^ int(data_id, 16))
+            if buckets:
+                session.execute(self.digest_table.insert(), [
+                    {'bucket': bucket, 'count': count, 'digest': format(digest, '064x')}
+                    for bucket, (count, digest) in buckets.items()])
             session.commit()
+        self._digests_checked = True
+    
+    def sync_digests(self, prefixes: Iterable[str], depth: int) -> Dict[str, tuple]:
+        """
+        Resúmenes (número de IDs, XOR de IDs) de los nodos del árbol de sync
+        
+        Args:
+            prefixes: Nodos padre cuyos descendientes se piden ('' es la raíz)
+            depth: Longitud de prefijo de los nodos devueltos (0 a DIGEST_PREFIX)
+            
+        Returns:
+            {prefijo: (count, digest)} de los nodos no vacíos
+        """
+        if not self._digests_checked:
+            # Una comprobación por instancia: los contadores deben cuadrar
+            with self.Session() as session:
+                stored = session.execute(
+                    sa.select(sa.func.sum(self.digest_table.c.count))).scalar() or 0
+                total = session.execute(
+                    sa.select(sa.func.count()).select_from(self.data_table)).scalar()
+            if stored != total:
+                self.rebuild_digests()
+            self._digests_checked = True
             
-        return data_id
+        prefixes = sorted(set(prefixes))
+        nodes = {}
+        with self.Session() as session:
+            for start in range(0, len(prefixes), 200):
+                chunk = prefixes[start:start + 200]
+                condition = sa.or_(*[self.digest_table.c.bucket.startswith(prefix, autoescape=True)
+                                     for prefix in chunk])
+                for row in session.execute(sa.select(self.digest_table).where(condition)):
+                    count, digest = nodes.get(row.bucket[:depth], (0, 0))
+                    nodes[row.bucket[:depth]] = (count + row.count,
+                                                 digest ^ int(row.digest, 16))
+        return {prefix: (count, format(digest, '064x'))
+                for prefix, (count, digest) in nodes.items() if count}
     
-    def retrieve_data(self, data_id: str) -> Union[Dict, List, pd.DataFrame]:
+    def bucket_ids(self, bucket: str) -> List[str]:
+        """IDs con un prefijo dado (rango sobre la clave primaria)"""
+        # Los IDs son hexadecimales en minúscula: 'g' acota el rango por arriba
+        stmt = sa.select(self.data_table.c.id).where(
+            self.data_table.c.id >= bucket,
+            self.data_table.c.id < bucket + 'g')
+        with self.Session() as session:
+            return list(session.execute(stmt).scalars())
+    
+    def retrieve_data(self, 
+                      data_id: str,
+                      cache_mode: Optional[str] = None,
+                      columns: Optional[List] = None) -> Union[Dict, List, pd.DataFrame]:
         """
         Recupera datos desde la singularidad
         
+        Los IDs son direcciones de contenido, así que la caché de lectura
+        nunca necesita invalidarse.
+        
         Args:
             data_id: ID cuántico de los datos
+            cache_mode: 'copy' o 'view' para esta lectura (None = el de la singularidad)
+            columns: Subconjunto de columnas a decodificar (solo DataFrames)
             
         Returns:
             Datos descomprimidos en formato original
         """
+        cache_mode = cache_mode or self.cache_mode
+        cached = self._cache_get(data_id)
+        if cached is not None:
+            if columns is not None:
+                return self._select_columns(cached, columns)
+            return self._cache_view(cached, cache_mode)
+            
+        decompressed = self._load_payload(data_id)
+        if columns is not None:
+            # Las lecturas parciales no se cachean: solo se decodifican esas columnas
+            return self._deserialize_data(decompressed, columns=columns)
+        data = self._deserialize_data(decompressed)
+        entry = self._cache_entry(data, decompressed)
+        if self._cache_put(data_id, entry, len(decompressed)):
+            return self._cache_view(entry, cache_mode)
+        return data
+    
+    def _load_payload(self, data_id):
+        """Lee, verifica y descomprime el contenido serializado de un ID"""
         with self.Session() as session:
             stmt = sa.select(self.data_table).where(
                 self.data_table.c.id == data_id)
@@ -111,85 +534,1166 @@ class DataSingularity:
             
             if not result:
                 raise SingularityError("Datos no encontrados en la singularidad")
+            return self._payload_from_row(result)
+    
+    def retrieve_many(self,
+                      data_ids: Iterable[str],
+                      cache_mode: Optional[str] = None) -> List[Union[Dict, List, pd.DataFrame]]:
+        """
+        Recupera varios IDs leyendo de la base de datos solo los que no están en caché
+        
+        Args:
+            data_ids: IDs cuánticos a recuperar
+            cache_mode: 'copy' o 'view' para esta lectura (None = el de la singularidad)
+            
+        Returns:
+            Datos descomprimidos en el orden de entrada
+        """
+        cache_mode = cache_mode or self.cache_mode
+        data_ids = list(data_ids)
+        found = {}
+        for data_id in set(data_ids):
+            cached = self._cache_get(data_id)
+            if cached is not None:
+                found[data_id] = cached
                 
-            # Verificación de integridad cuántica
-            current_hash = self._generate_quantum_hash(result.compressed_data)
-            if current_hash != result.quantum_hash:
-                raise SingularityError("Corrupción cuántica detectada en los datos")
+        missing = [data_id for data_id in set(data_ids) if data_id not in found]
+        for row in self._export_rows(missing):
+            decompressed = self._payload_from_row(SimpleNamespace(**row))
+            entry = self._cache_entry(self._deserialize_data(decompressed), decompressed)
+            self._cache_put(row['id'], entry, len(decompressed))
+            found[row['id']] = entry
+            
+        if len(found) < len(set(data_ids)):
+            raise SingularityError("Datos no encontrados en la singularidad")
+        # Se entregan copias o vistas aunque el ID se repita en la entrada
+        return [self._cache_view(found[data_id], cache_mode) for data_id in data_ids]
+    
+    def _payload_from_row(self, row):
+        """Verifica y descomprime el blob de una fila"""
+        verify = not self._trusted(row)
+        if row.chunks:
+            # Un único buffer del tamaño final: sin copias intermedias por trozo
+            payload = bytearray(row.size)
+            for seq, offset, size in self._chunk_layout(row):
+                payload[offset:offset + size] = self._read_chunk(row.id, seq, verify)
+            return payload
+            
+        # Verificación de integridad cuántica
+        if verify and self._generate_quantum_hash(row.compressed_data) != row.quantum_hash:
+            raise SingularityError("Corrupción cuántica detectada en los datos")
+            
+        # Descompresión
+        return self.compressor.decompress(row.compressed_data)
+    
+    def iter_data(self,
+                  data_id: str,
+                  offset: int = 0,
+                  length: Optional[int] = None) -> Iterable[bytes]:
+        """
+        Itera el contenido serializado de un ID trozo a trozo
+        
+        Solo se leen y descomprimen los trozos que cubren el rango pedido,
+        así que la memoria usada está acotada por chunk_bytes y no por el
+        tamaño del objeto.
+        
+        Args:
+            data_id: ID cuántico de los datos
+            offset: Primer byte del rango
+            length: Bytes a leer (None = hasta el final)
+            
+        Returns:
+            Generador de bloques de bytes descomprimidos y verificados
+        """
+        row = self._load_row_meta(data_id)
+        end = row.size if length is None else min(row.size, offset + length)
+        if not row.chunks:
+            if offset < end:
+                yield bytes(self._load_payload(data_id)[offset:end])
+            return
+        verify = not self._trusted(row)
+        for seq, chunk_offset, size in self._chunk_layout(row):
+            if chunk_offset + size <= offset or chunk_offset >= end:
+                continue
+            chunk = self._read_chunk(data_id, seq, verify)
+            yield chunk[max(0, offset - chunk_offset):end - chunk_offset]
+    
+    def read_range(self, data_id: str, offset: int, length: int) -> bytes:
+        """Lee un rango de bytes del contenido serializado de un ID"""
+        return b''.join(self.iter_data(data_id, offset, length))
+    
+    def open_data(self, data_id: str) -> io.BufferedReader:
+        """Lector de fichero (read/seek) sobre el contenido serializado de un ID"""
+        return io.BufferedReader(SingularityReader(self, data_id), buffer_size=self.chunk_bytes)
+    
+    def _load_row_meta(self, data_id):
+        """Tamaño y número de trozos de un ID, sin leer su blob"""
+        table = self.data_table
+        stmt = sa.select(table.c.id, table.c.quantum_hash, table.c.size, table.c.chunks,
+                         table.c.verified_at).where(table.c.id == data_id)
+        with self.Session() as session:
+            row = session.execute(stmt).fetchone()
+        if not row:
+            raise SingularityError("Datos no encontrados en la singularidad")
+        if row.size is None:
+            # Filas sin tamaño registrado: se mide el contenido una vez
+            return SimpleNamespace(id=row.id, quantum_hash=row.quantum_hash,
+                                   size=len(self._load_payload(data_id)), chunks=None,
+                                   verified_at=row.verified_at)
+        return row
+    
+    def _chunk_layout(self, row):
+        """(seq, offset, size) de los trozos de un objeto, verificando su hash conjunto"""
+        table = self.chunk_table
+        stmt = sa.select(table.c.seq, table.c.offset, table.c.size, table.c.quantum_hash).where(
+            table.c.data_id == row.id).order_by(table.c.seq)
+        with self.Session() as session:
+            layout = session.execute(stmt).fetchall()
+        if len(layout) != row.chunks:
+            raise SingularityError("Corrupción cuántica detectada: faltan trozos")
+        chunk_hashes = hashlib.blake2b()
+        for chunk in layout:
+            chunk_hashes.update(chunk.quantum_hash.encode('ascii'))
+        if chunk_hashes.hexdigest() != row.quantum_hash:
+            raise SingularityError("Corrupción cuántica detectada en los datos")
+        return [(chunk.seq, chunk.offset, chunk.size) for chunk in layout]
+    
+    def _read_chunk(self, data_id, seq, verify=True):
+        """Lee, verifica y descomprime un trozo"""
+        stmt = sa.select(self.chunk_table).where(
+            self.chunk_table.c.data_id == data_id, self.chunk_table.c.seq == seq)
+        with self.Session() as session:
+            chunk = session.execute(stmt).fetchone()
+        if chunk is None:
+            raise SingularityError("Corrupción cuántica detectada: faltan trozos")
+        if verify and self._generate_quantum_hash(chunk.compressed_data) != chunk.quantum_hash:
+            raise SingularityError("Corrupción cuántica detectada en los datos")
+        return self.compressor.decompress(chunk.compressed_data)
+    
+    def _trusted(self, row):
+        """La fila se verificó dentro de la ventana de confianza"""
+        verified_at = getattr(row, 'verified_at', None)
+        return (self.trust_hours is not None and verified_at is not None
+                and time.time() - verified_at < self.trust_hours * 3600)
+    
+    def verify_all(self,
+                   workers: int = 4,
+                   page_size: int = 500,
+                   max_bytes_per_second: Optional[float] = None,
+                   older_than_hours: Optional[float] = None,
+                   stop_event: Optional[threading.Event] = None) -> Dict:
+        """
+        Recorre la singularidad recalculando el hash de cada fila y trozo
+        
+        Las filas se leen por páginas de clave primaria y sus hashes se
+        calculan en hilos (hashlib libera el GIL). Las filas correctas
+        registran verified_at, que usa el modo de lectura trust_hours, y las
+        corruptas lo pierden en la misma transacción.
+        
+        Args:
+            workers: Hilos de hashing
+            page_size: Filas leídas por consulta
+            max_bytes_per_second: Límite de lectura para ejecutarlo en segundo plano
+            older_than_hours: Solo filas sin verificar en ese tiempo (None = todas)
+            stop_event: threading.Event que detiene el recorrido al activarse
+            
+        Returns:
+            Informe con filas y bytes comprobados, IDs corruptos y duración
+        """
+        table = self.data_table
+        started = time.perf_counter()
+        report = {'checked': 0, 'bytes': 0, 'corrupt': [], 'completed': False}
+        condition = sa.true()
+        if older_than_hours is not None:
+            cutoff = time.time() - older_than_hours * 3600
+            condition = sa.or_(table.c.verified_at.is_(None), table.c.verified_at < cutoff)
+            
+        # Solo lo que _verify_row necesita: ni índices temporales ni dimensiones
+        columns = [table.c.id, table.c.quantum_hash, table.c.chunks, table.c.compressed_data]
+        last = None
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while stop_event is None or not stop_event.is_set():
+                stmt = sa.select(*columns).where(condition).order_by(table.c.id).limit(page_size)
+                if last is not None:
+                    stmt = stmt.where(table.c.id > last)
+                with self.Session() as session:
+                    rows = session.execute(stmt).fetchall()
+                if not rows:
+                    report['completed'] = True
+                    break
+                last = rows[-1].id
                 
-            # Descompresión y reconstrucción
-            decompressed = self.compressor.decompress(result.compressed_data)
-            return self._deserialize_data(decompressed)
+                verified, corrupt, now = [], [], time.time()
+                for row, (valid, nbytes) in zip(rows, executor.map(self._verify_row, rows)):
+                    report['checked'] += 1
+                    report['bytes'] += nbytes
+                    if valid:
+                        verified.append(row.id)
+                    else:
+                        corrupt.append(row.id)
+                        print(f"Corrupción cuántica detectada en {row.id}")
+                report['corrupt'].extend(corrupt)
+                with self.Session() as session:
+                    if verified:
+                        session.execute(table.update().where(
+                            table.c.id.in_(verified)).values(verified_at=now))
+                    if corrupt:
+                        # Una verificación anterior ya no permite saltarse el hash al leer
+                        session.execute(table.update().where(
+                            table.c.id.in_(corrupt)).values(verified_at=None))
+                    session.commit()
+                        
+                if max_bytes_per_second:
+                    # Se duerme lo necesario para no superar el ritmo medio pedido
+                    ahead = report['bytes'] / max_bytes_per_second - (time.perf_counter() - started)
+                    if ahead > 0:
+                        time.sleep(ahead)
+                        
+        report['elapsed'] = time.perf_counter() - started
+        return report
+    
+    def _verify_row(self, row):
+        """(hash correcto, bytes comprobados) de una fila y sus trozos"""
+        if not row.chunks:
+            valid = self._generate_quantum_hash(row.compressed_data) == row.quantum_hash
+            return valid, len(row.compressed_data)
+        nbytes = 0
+        try:
+            self._chunk_layout(row)
+            for chunk in self._export_chunks(row.id):
+                nbytes += len(chunk['compressed_data'])
+                if self._generate_quantum_hash(chunk['compressed_data']) != chunk['quantum_hash']:
+                    return False, nbytes
+        except SingularityError:
+            return False, nbytes
+        return True, nbytes
+    
+    def _export_chunks(self, data_id):
+        """Trozos comprimidos de un objeto, uno a uno (sin descomprimir)"""
+        table = self.chunk_table
+        stmt = sa.select(table.c.seq).where(table.c.data_id == data_id).order_by(table.c.seq)
+        with self.Session() as session:
+            sequence = list(session.execute(stmt).scalars())
+        for seq in sequence:
+            with self.Session() as session:
+                chunk = session.execute(sa.select(table).where(
+                    table.c.data_id == data_id, table.c.seq == seq)).fetchone()
+            yield dict(chunk._mapping)
+    
+    def _cache_get(self, data_id):
+        """Objeto cacheado de un ID (None si no está)"""
+        with self._cache_lock:
+            entry = self._read_cache.get(data_id)
+            if entry is None:
+                self.cache_misses += 1
+                return None
+            self._read_cache.move_to_end(data_id)
+            self.cache_hits += 1
+            return entry[0]
+    
+    def _cache_put(self, data_id, data, size):
+        """Cachea un objeto desalojando por LRU hasta caber en cache_bytes"""
+        if size > self.cache_bytes:
+            return False
+        with self._cache_lock:
+            if data_id in self._read_cache:
+                return True
+            self._read_cache[data_id] = (data, size)
+            self._cache_used += size
+            while self._cache_used > self.cache_bytes:
+                _, (_, evicted) = self._read_cache.popitem(last=False)
+                self._cache_used -= evicted
+        return True
+    
+    def _cache_entry(self, data, decompressed):
+        """Forma cacheada de un objeto: el DataFrame o los bytes JSON"""
+        if isinstance(data, pd.DataFrame):
+            return data
+        # Re-parsear los bytes es varias veces más rápido que deepcopy
+        return _CachedJson(decompressed)
+    
+    def _cache_view(self, entry, cache_mode):
+        """Copia independiente o vista de solo lectura de una entrada cacheada"""
+        if isinstance(entry, pd.DataFrame):
+            # Sin copy-on-write una copia superficial escribiría en la cacheada
+            if cache_mode == 'view' and self._copy_on_write():
+                return entry.copy(deep=False)
+            return entry.copy()
+        if cache_mode == 'view':
+            return entry.view()
+        return json.loads(entry.payload)
+    
+    @staticmethod
+    def _copy_on_write():
+        """pandas aplica copy-on-write (siempre desde la 3.0, opcional en la 2.x)"""
+        if int(pd.__version__.split('.')[0]) >= 3:
+            return True
+        return pd.options.mode.copy_on_write is True
+    
+    def cache_stats(self) -> Dict:
+        """Estadísticas de la caché de lectura"""
+        with self._cache_lock:
+            lookups = self.cache_hits + self.cache_misses
+            return {
+                'entries': len(self._read_cache),
+                'bytes': self._cache_used,
+                'capacity_bytes': self.cache_bytes,
+                'hits': self.cache_hits,
+                'misses': self.cache_misses,
+                'hit_rate': self.cache_hits / lookups if lookups else 0.0
+            }
+    
+    def clear_cache(self):
+        """Vacía la caché de lectura"""
+        with self._cache_lock:
+            self._read_cache.clear()
+            self._cache_used = 0
     
     def _serialize_data(self, data):
         """Convierte datos a formato serializable"""
+        return b''.join(self._serialize_parts(data))
+    
+    def _serialize_parts(self, data):
+        """Formato serializable como lista de buffers consecutivos"""
         if isinstance(data, pd.DataFrame):
-            return data.to_json(orient='records')
+            return self._serialize_frame(data)
         elif isinstance(data, (dict, list)):
-            return json.dumps(data)
+            return [json.dumps(data).encode('utf-8')]
         else:
             raise SingularityError("Tipo de datos no soportado")
             
-    def _deserialize_data(self, data):
+    def _deserialize_data(self, data, columns=None):
         """Reconstruye datos desde formato serializado"""
+        if data[:len(self.COLUMNAR_MAGIC)] == self.COLUMNAR_MAGIC:
+            return self._deserialize_frame(data, columns)
+        if columns is not None:
+            raise SingularityError("La lectura por columnas solo admite DataFrames columnares")
         decoded = data.decode('utf-8')
         try:
             return json.loads(decoded)
         except json.JSONDecodeError:
             return pd.read_json(decoded)
     
+    # Formato columnar: COLUMNAR_MAGIC, cabecera JSON con prefijo de 4 bytes
+    # (esquema y desplazamientos) y un buffer alineado a 8 bytes por columna
+    COLUMNAR_MAGIC = b'QCOL\x01'
+    
+    def _serialize_frame(self, frame):
+        """Serializa un DataFrame en formato columnar binario tipado (lista de buffers)"""
+        index, columns = None, []
+        if not (isinstance(frame.index, pd.RangeIndex)
+                and frame.index.start == 0 and frame.index.step == 1):
+            # Los niveles del índice se guardan como primeras columnas con nombres
+            # reservados (pueden coincidir con una columna); los reales van en index
+            index = {'levels': frame.index.nlevels, 'names': list(frame.index.names)}
+            columns = [(f'__index_level_{level}__',
+                        pd.Series(frame.index.get_level_values(level)))
+                       for level in range(frame.index.nlevels)]
+        columns += [(frame.columns[position], frame.iloc[:, position])
+                    for position in range(frame.shape[1])]
+            
+        specs, buffers, offset = [], [], 0
+        for name, column in columns:
+            buffer, spec = self._encode_column(column)
+            spec.update(name=name, offset=offset, nbytes=len(buffer))
+            padding = -len(buffer) % 8
+            buffers.extend([buffer, b'\0' * padding] if padding else [buffer])
+            specs.append(spec)
+            offset += len(buffer) + padding
+            
+        header = json.dumps({'rows': len(frame), 'columns': specs, 'index': index},
+                            default=str).encode('utf-8')
+        prefix = self.COLUMNAR_MAGIC + struct.pack('>I', len(header)) + header
+        prefix += b'\0' * (-len(prefix) % 8)
+        return [prefix] + buffers
+    
+    def _encode_column(self, series):
+        """Buffer binario de una columna: crudo si el dtype es numérico NumPy"""
+        if isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biufcmM':
+            values = np.ascontiguousarray(series.to_numpy())
+            # Vista de bytes sobre el array: la columna no se copia
+            return values.reshape(-1).view(np.uint8), {'kind': 'raw', 'dtype': values.dtype.str}
+        values = series.astype(object).where(series.notna(), None).tolist()
+        encoded = json.dumps(values, default=str).encode('utf-8')
+        return encoded, {'kind': 'json', 'dtype': str(series.dtype)}
+    
+    def _deserialize_frame(self, data, columns=None):
+        """Reconstruye un DataFrame columnar decodificando solo las columnas pedidas"""
+        magic_len = len(self.COLUMNAR_MAGIC)
+        header_len = struct.unpack('>I', data[magic_len:magic_len + 4])[0]
+        header_end = magic_len + 4 + header_len
+        header = json.loads(data[magic_len + 4:header_end])
+        body = header_end + (-header_end % 8)
+        buffer = memoryview(data)
+        
+        index = header['index']
+        levels = index['levels'] if index else 0
+        specs = header['columns']
+        wanted = specs[levels:]
+        if columns is not None:
+            wanted = [spec for spec in wanted if spec['name'] in columns]
+            
+        decoded = [self._decode_column(buffer, body, spec, header['rows'])
+                   for spec in specs[:levels] + wanted]
+        frame = pd.DataFrame(dict(enumerate(decoded[levels:])), index=None)
+        frame.columns = [spec['name'] for spec in wanted]
+        if index:
+            arrays = decoded[:levels]
+            if levels == 1:
+                frame.index = pd.Index(arrays[0], name=index['names'][0])
+            else:
+                frame.index = pd.MultiIndex.from_arrays(arrays, names=index['names'])
+        return frame
+    
+    def _decode_column(self, buffer, body, spec, rows):
+        """Decodifica una columna; las numéricas son vistas sin copia del buffer"""
+        start = body + spec['offset']
+        if spec['kind'] == 'raw':
+            return np.frombuffer(buffer, dtype=np.dtype(spec['dtype']),
+                                 count=rows, offset=start)
+        values = json.loads(bytes(buffer[start:start + spec['nbytes']]))
+        try:
+            return pd.Series(values, dtype=spec['dtype'])
+        except (TypeError, ValueError):
+            return pd.Series(values, dtype=object)
+    
+    def _select_columns(self, data, columns):
+        """Subconjunto de columnas de un DataFrame cacheado"""
+        if not isinstance(data, pd.DataFrame):
+            raise SingularityError("La lectura por columnas solo admite DataFrames columnares")
+        return data.loc[:, [name for name in data.columns if name in columns]].copy()
+    
     def _generate_quantum_id(self, data):
         """Genera ID único basado en propiedades cuánticas"""
-        return hashlib.sha3_256(data.encode()).hexdigest()
+        return hashlib.sha3_256(data).hexdigest()
     
     def _generate_quantum_hash(self, data):
         """Genera hash de integridad cuántica"""
         return hashlib.blake2b(data).hexdigest()
     
-    def create_wormhole(self, target_singularity: str):
+    def query_range(self,
+                    start=None,
+                    end=None,
+                    dimensions: Optional[Union[int, Iterable[int]]] = None,
+                    with_data: bool = False,
+                    chunk_size: int = 1000):
+        """
+        Itera en orden temporal los registros ingeridos en [start, end)
+        
+        Usa el índice de ingested_at con paginación por clave (ingested_at, id),
+        sin mantener un cursor abierto entre bloques.
+        
+        Args:
+            start: Inicio del rango (datetime, ISO 8601 o epoch; None = sin límite)
+            end: Fin exclusivo del rango (mismos formatos; None = sin límite)
+            dimensions: Dimensión o dimensiones a incluir (None = todas)
+            with_data: Devuelve (id, datos) en lugar de solo el id
+            chunk_size: Filas leídas por consulta
+            
+        Yields:
+            IDs cuánticos, o tuplas (id, datos) si with_data
+        """
+        table = self.data_table
+        columns = [table.c.id, table.c.ingested_at]
+        if with_data:
+            # Todo lo que _payload_from_row necesita, incluidos los trozos
+            columns += [table.c.quantum_hash, table.c.compressed_data, table.c.size,
+                        table.c.chunks, table.c.verified_at]
+            
+        conditions = [table.c.ingested_at.is_not(None)]
+        if start is not None:
+            conditions.append(table.c.ingested_at >= self.indexer.to_epoch(start))
+        if end is not None:
+            conditions.append(table.c.ingested_at < self.indexer.to_epoch(end))
+        if dimensions is not None:
+            if isinstance(dimensions, int):
+                dimensions = [dimensions]
+            conditions.append(table.c.dimensions.in_(list(dimensions)))
+            
+        last = None
+        while True:
+            page = list(conditions)
+            if last is not None:
+                page.append(sa.or_(
+                    table.c.ingested_at > last[0],
+                    sa.and_(table.c.ingested_at == last[0], table.c.id > last[1])))
+            stmt = sa.select(*columns).where(*page).order_by(
+                table.c.ingested_at, table.c.id).limit(chunk_size)
+            with self.Session() as session:
+                rows = session.execute(stmt).fetchall()
+                
+            for row in rows:
+                if with_data:
+                    yield row.id, self._deserialize_data(self._payload_from_row(row))
+                else:
+                    yield row.id
+            if len(rows) < chunk_size:
+                return
+            last = (rows[-1].ingested_at, rows[-1].id)
+    
+    def train_dictionary(self,
+                         sample_size: int = 1000,
+                         dict_size: int = 32 * 1024) -> Optional[int]:
+        """
+        Entrena y activa un diccionario compartido a partir de registros guardados
+        
+        Args:
+            sample_size: Registros pequeños (los más recientes) a muestrear
+            dict_size: Tamaño máximo del diccionario en bytes
+            
+        Returns:
+            ID de la nueva versión del diccionario (None si no hay muestras)
+        """
+        table = self.data_table
+        samples = []
+        with self.Session() as session:
+            # Los registros troceados tienen el blob vacío; los más recientes
+            # salen del índice de ingested_at sin ordenar toda la tabla
+            stmt = sa.select(table.c.compressed_data).where(
+                table.c.chunks.is_(None),
+                sa.or_(table.c.size.is_(None),
+                       table.c.size < self.compressor.hot_threshold)
+            ).order_by(table.c.ingested_at.desc()).limit(sample_size * 4)
+            for blob in session.execute(stmt).scalars():
+                payload = self.compressor.decompress(blob)
+                if len(payload) < self.compressor.hot_threshold:
+                    samples.append(payload)
+                if len(samples) >= sample_size:
+                    break
+                    
+        if not samples:
+            return None
+        dictionary = QuantumCompressor.train_dictionary(samples, dict_size)
+        dictionary_id = QuantumCompressor.dictionary_id(dictionary)
+        
+        with self.Session() as session:
+            stmt = sa.select(self.dictionary_table.c.id).where(
+                self.dictionary_table.c.id == dictionary_id)
+            if session.execute(stmt).first() is None:
+                session.execute(self.dictionary_table.insert().values(
+                    id=dictionary_id, dictionary=dictionary, created=time.time()))
+                session.commit()
+        self.compressor.load_dictionary(dictionary_id, dictionary, activate=True)
+        return dictionary_id
+    
+    def _load_dictionaries(self):
+        """Carga los diccionarios guardados y activa la versión más reciente"""
+        with self.Session() as session:
+            stmt = sa.select(self.dictionary_table).order_by(
+                self.dictionary_table.c.created)
+            for row in session.execute(stmt):
+                self.compressor.load_dictionary(row.id, row.dictionary, activate=True)
+                
+    def _fetch_dictionary(self, dictionary_id):
+        """Recupera un diccionario creado por otro proceso sobre la misma singularidad"""
+        with self.Session() as session:
+            stmt = sa.select(self.dictionary_table.c.dictionary).where(
+                self.dictionary_table.c.id == dictionary_id)
+            return session.execute(stmt).scalar()
+    
+    def create_wormhole(self, target_singularity: Union[str, 'DataSingularity']):
         """Establece conexión con otra singularidad"""
         return WormholeConnection(self, target_singularity)
     
-    def backup_singularity(self, backup_path: str):
-        """Crea respaldo comprimido de la singularidad"""
-        backup_file = Path(backup_path) / f"singularity_bkp_{int(time.time())}.sq"
+    def _export_rows(self, data_ids):
+        """Filas completas (blob comprimido incluido) de los IDs existentes
+        
+        Los trozos de los objetos grandes se exportan aparte con _export_chunks.
+        """
+        data_ids = list(data_ids)
+        rows = []
         with self.Session() as session:
-            stmt = sa.select(self.data_table)
-            result = session.execute(stmt).fetchall()
-            
-        quantum_backup = {
-            'metadata': {
-                'version': '4.3',
-                'compression': self.compression,
-                'quantum': self.quantum,
-                'created': datetime.utcnow().isoformat()
-            },
-            'data': [dict(row) for row in result]
-        }
+            for start in range(0, len(data_ids), 500):
+                stmt = sa.select(self.data_table).where(
+                    self.data_table.c.id.in_(data_ids[start:start + 500]))
+                rows.extend(dict(row._mapping) for row in session.execute(stmt))
+        return rows
+    
+    def _export_dictionaries(self, dictionary_ids):
+        """Diccionarios de compresión por ID"""
+        stmt = sa.select(self.dictionary_table).where(
+            self.dictionary_table.c.id.in_(list(dictionary_ids)))
+        with self.Session() as session:
+            return [dict(row._mapping) for row in session.execute(stmt)]
+    
+    # Formato de respaldo: BACKUP_MAGIC seguido de tramas
+    # [tipo (1 byte)][longitud (4 bytes)][cabecera JSON con prefijo de 4 bytes][binario]
+    # La versión 3 añade tramas 'C' con los trozos tras la fila que los usa
+    BACKUP_MAGIC = b'QSBK\x03'
+    BACKUP_READABLE = (b'QSBK\x02', b'QSBK\x03')
+    
+    # Segundos que un incremental repite antes de `since`: stored_at se fija
+    # antes del commit y una fila aún sin confirmar durante el respaldo
+    # anterior quedaría por debajo de su watermark. Restaurar descarta duplicados
+    BACKUP_OVERLAP = 600
+    
+    def backup_singularity(self, 
+                           backup_path: str,
+                           since: Optional[Union[str, float]] = None,
+                           chunk_size: int = 1000):
+        """
+        Crea respaldo en streaming de la singularidad
+        
+        Los blobs se copian ya comprimidos, fila a fila, así que la memoria
+        usada no depende del tamaño de la singularidad.
         
-        compressed = self.compressor.compress(
-            json.dumps(quantum_backup).encode())
+        Args:
+            backup_path: Directorio destino del respaldo
+            since: Respaldo previo (ruta) o marca temporal; solo se incluyen
+                las filas llegadas a esta singularidad desde entonces
+                (respaldo incremental, según stored_at)
+            chunk_size: Filas leídas por bloque de la base de datos
+            
+        Returns:
+            Ruta del fichero de respaldo
+        """
+        if isinstance(since, (str, Path)):
+            since = self.read_backup_metadata(since)['watermark']
+        suffix = '_inc' if since is not None else ''
+        backup_file = Path(backup_path) / f"singularity_bkp_{int(time.time())}{suffix}.sq"
+        table = self.data_table
         
-        with open(backup_file, 'wb') as f:
-            f.write(compressed)
+        with self.Session() as session:
+            watermark = session.execute(
+                sa.select(sa.func.max(table.c.stored_at))).scalar()
+            
+            if since is None:
+                condition = sa.or_(table.c.stored_at.is_(None),
+                                   table.c.stored_at <= watermark)
+            else:
+                # Las filas repetidas en el solape se descartan al restaurar
+                condition = sa.and_(table.c.stored_at >= since - self.BACKUP_OVERLAP,
+                                    table.c.stored_at <= watermark)
+                
+            with open(backup_file, 'wb') as f:
+                f.write(self.BACKUP_MAGIC)
+                self._write_frame(f, b'M', {
+                    'version': '4.3',
+                    'compression': self.compression,
+                    'quantum': self.quantum,
+                    'created': datetime.utcnow().isoformat(),
+                    'since': since,
+                    'watermark': watermark
+                })
+                
+                for row in session.execute(sa.select(self.dictionary_table)):
+                    self._write_frame(f, b'D', {'id': row.id, 'created': row.created},
+                                      row.dictionary)
+                    
+                rows = 0
+                stmt = sa.select(table).where(condition)
+                result = session.execute(stmt, execution_options={'yield_per': chunk_size})
+                for row in result:
+                    record = dict(row._mapping)
+                    blob = record.pop('compressed_data')
+                    self._write_frame(f, b'R', record, blob)
+                    rows += 1
+                    if record.get('chunks'):
+                        for chunk in self._export_chunks(record['id']):
+                            self._write_frame(f, b'C', chunk, chunk.pop('compressed_data'))
+                    
+                self._write_frame(f, b'E', {'rows': rows})
             
         return backup_file
+    
+    def restore_singularity(self, backup_file: str, batch_size: int = 1000) -> int:
+        """
+        Restaura en streaming un respaldo (completo o incremental)
+        
+        Args:
+            backup_file: Fichero creado por backup_singularity
+            batch_size: Filas por transacción (como máximo 4 * chunk_bytes
+                de blobs comprimidos en memoria)
+            
+        Returns:
+            Número de filas nuevas restauradas
+        """
+        restored = 0
+        batch, chunks, batch_bytes = [], [], 0
+        # IDs troceados restaurados: sus trozos pueden llegar en el lote siguiente
+        chunked = set()
+        with open(backup_file, 'rb') as f:
+            self._check_backup_magic(f)
+            for kind, header, payload in self._read_frames(f):
+                if kind == b'D':
+                    self._restore_dictionary(header, payload)
+                elif kind in (b'R', b'C'):
+                    header['compressed_data'] = payload
+                    (batch if kind == b'R' else chunks).append(header)
+                    # Filas en línea y trozos comparten el límite de memoria del lote
+                    batch_bytes += len(payload)
+                    if len(batch) >= batch_size or batch_bytes >= self.chunk_bytes * 4:
+                        restored += self._restore_batch(batch, chunks, chunked)
+                        batch, chunks, batch_bytes = [], [], 0
+                elif kind == b'E':
+                    break
+            else:
+                raise SingularityError("Respaldo truncado: falta la trama final")
+                
+        if batch or chunks:
+            restored += self._restore_batch(batch, chunks, chunked)
+        self._load_dictionaries()
+        return restored
+    
+    def read_backup_metadata(self, backup_file: str) -> Dict:
+        """Lee los metadatos de cabecera de un respaldo"""
+        with open(backup_file, 'rb') as f:
+            self._check_backup_magic(f)
+            for kind, header, _ in self._read_frames(f):
+                if kind == b'M':
+                    return header
+        raise SingularityError("Respaldo sin metadatos")
+    
+    def _restore_dictionary(self, header, dictionary):
+        """Restaura un diccionario de compresión si aún no existe"""
+        with self.Session() as session:
+            stmt = sa.select(self.dictionary_table.c.id).where(
+                self.dictionary_table.c.id == header['id'])
+            if session.execute(stmt).first() is None:
+                session.execute(self.dictionary_table.insert().values(
+                    id=header['id'], dictionary=dictionary, created=header['created']))
+                session.commit()
+    
+    def _restore_batch(self, rows, chunks=(), chunked=None):
+        """Inserta un bloque de filas (y trozos) restauradas en una transacción"""
+        chunked = set() if chunked is None else chunked
+        with self.Session() as session:
+            inserted = self._insert_rows(session, rows) if rows else []
+            new_ids = set(inserted)
+            chunked.update(row['id'] for row in rows
+                           if row.get('chunks') and row['id'] in new_ids)
+            # Los trozos de filas que ya existían se descartan con ellas
+            chunks = [chunk for chunk in chunks if chunk['data_id'] in chunked]
+            if chunks:
+                session.execute(self.chunk_table.insert(), chunks)
+            session.commit()
+        return len(inserted)
+    
+    @staticmethod
+    def _write_frame(f, kind, header, payload=b''):
+        """Escribe una trama de respaldo"""
+        header = json.dumps(header).encode('utf-8')
+        f.write(kind + struct.pack('>I', 4 + len(header) + len(payload)))
+        f.write(struct.pack('>I', len(header)) + header)
+        f.write(payload)
+    
+    @staticmethod
+    def _read_frames(f):
+        """Itera las tramas de un respaldo: (tipo, cabecera, binario)"""
+        while True:
+            prefix = f.read(5)
+            if not prefix:
+                return
+            if len(prefix) < 5:
+                raise SingularityError("Respaldo truncado")
+            kind = prefix[:1]
+            frame = f.read(struct.unpack('>I', prefix[1:])[0])
+            header_len = struct.unpack('>I', frame[:4])[0]
+            header = json.loads(frame[4:4 + header_len])
+            yield kind, header, frame[4 + header_len:]
+    
+    def _check_backup_magic(self, f):
+        """Valida la cabecera del fichero de respaldo"""
+        if f.read(len(self.BACKUP_MAGIC)) not in self.BACKUP_READABLE:
+            raise SingularityError("Formato de respaldo no reconocido")
+
+def _freeze_json(value):
+    """Versión de solo lectura de un objeto JSON (mappingproxy y tuplas)"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze_json(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze_json(item) for item in value)
+    return value
+
+
+class _CachedJson:
+    """Entrada de caché de un dict/list: bytes JSON y vista congelada perezosa"""
+    
+    __slots__ = ('payload', '_frozen')
+    
+    def __init__(self, payload):
+        self.payload = payload
+        self._frozen = None
+        
+    def view(self):
+        """Vista compartida de solo lectura (se construye una sola vez)"""
+        if self._frozen is None:
+            self._frozen = _freeze_json(json.loads(self.payload))
+        return self._frozen
+
+
+class SingularityReader(io.RawIOBase):
+    """Lector de fichero sobre el contenido serializado de un ID"""
+    def __init__(self, singularity, data_id):
+        self.singularity = singularity
+        self.data_id = data_id
+        row = singularity._load_row_meta(data_id)
+        self.size = row.size
+        self.verify = not singularity._trusted(row)
+        # Los objetos en línea son un único trozo de todo el contenido
+        self.layout = (singularity._chunk_layout(row) if row.chunks
+                       else [(None, 0, row.size)])
+        self.position = 0
+        self._chunk = (None, None)
+        
+    def readable(self):
+        return True
+    
+    def seekable(self):
+        return True
+    
+    def tell(self):
+        return self.position
+    
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self.position, io.SEEK_END: self.size}[whence]
+        self.position = max(0, base + offset)
+        return self.position
+    
+    def readinto(self, buffer):
+        view = memoryview(buffer).cast('B')
+        end = min(self.size, self.position + len(view))
+        written = 0
+        for seq, offset, size in self.layout:
+            if offset + size <= self.position or offset >= end:
+                continue
+            chunk = self._load_chunk(seq)
+            block = chunk[self.position - offset:end - offset]
+            view[written:written + len(block)] = block
+            written += len(block)
+            self.position += len(block)
+        return written
+    
+    def _load_chunk(self, seq):
+        """Trozo descomprimido; se conserva el último para lecturas contiguas"""
+        if self._chunk[0] != seq or self._chunk[1] is None:
+            if seq is None:
+                chunk = self.singularity._load_payload(self.data_id)
+            else:
+                chunk = self.singularity._read_chunk(self.data_id, seq, self.verify)
+            self._chunk = (seq, memoryview(chunk))
+        return self._chunk[1]
+
+class ShardedSingularity:
+    """Singularidad repartida entre varios almacenes por prefijo del ID de contenido"""
+    def __init__(self,
+                 event_horizons: List[str],
+                 workers: Optional[int] = None,
+                 processes: bool = True,
+                 **singularity_options):
+        """
+        Abre un fragmento (DataSingularity) por horizonte de eventos
+        
+        Args:
+            event_horizons: Connection strings de los fragmentos, en orden
+            workers: Hilos o procesos de fan-out (None = uno por fragmento)
+            processes: Comprime y escribe cada fragmento en un proceso propio;
+                la ingesta es CPU en Python y con hilos no escala por el GIL
+            singularity_options: Argumentos comunes para cada DataSingularity
+        """
+        if not event_horizons:
+            raise ValueError("Se necesita al menos un fragmento")
+        self.options = singularity_options
+        self.workers = workers
+        self.processes = processes
+        self._pool = None
+        self.shards = [self._open_shard(event_horizon) for event_horizon in event_horizons]
+        
+    def _open_shard(self, event_horizon):
+        """Crea la singularidad de un fragmento"""
+        # Cada hilo de SQLAlchemy vería su propia base ':memory:' vacía
+        if event_horizon.startswith('sqlite') and ':memory:' in event_horizon:
+            raise ValueError("Los fragmentos necesitan ficheros o servidores, no ':memory:'")
+        return DataSingularity(event_horizon=event_horizon, **self.options)
+    
+    def _executor(self):
+        """Pool de hilos para repartir trabajo entre fragmentos"""
+        return ThreadPoolExecutor(max_workers=self.workers or len(self.shards))
+    
+    def _get_pool(self):
+        """Pool persistente de procesos de escritura"""
+        if self._pool is None:
+            import multiprocessing
+            # spawn: los trabajadores abren sus propias conexiones, nunca heredadas
+            context = multiprocessing.get_context('spawn')
+            self._pool = context.Pool(processes=self.workers or len(self.shards))
+        return self._pool
+    
+    def close_pool(self):
+        """Libera los procesos de escritura"""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close_pool()
+    
+    def shard_index(self, data_id: str, shards: Optional[int] = None) -> int:
+        """
+        Fragmento de un ID por hash consistente "jump" (Lamping y Veach)
+        
+        Al pasar de N a N+1 fragmentos solo cambia de sitio ~1/(N+1) de los
+        IDs, siempre que los fragmentos nuevos se añadan al final de la lista.
+        
+        Args:
+            data_id: ID cuántico (hexadecimal)
+            shards: Número de fragmentos (None = los actuales)
+            
+        Returns:
+            Posición del fragmento en la lista
+        """
+        shards = shards or len(self.shards)
+        key = int(data_id[:16], 16)
+        bucket, jump = -1, 0
+        while jump < shards:
+            bucket = jump
+            key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+            jump = int((bucket + 1) * (float(1 << 31) / float((key >> 33) + 1)))
+        return bucket
+    
+    def shard_for(self, data_id: str) -> DataSingularity:
+        """Singularidad que almacena un ID"""
+        return self.shards[self.shard_index(data_id)]
+    
+    def ingest_data(self, 
+                   data: Union[Dict, List, pd.DataFrame], 
+                   dimensions: int = 4) -> str:
+        """Absorbe datos en su fragmento y devuelve el ID cuántico"""
+        return self.ingest_many([data], dimensions=dimensions)[0]
+    
+    def ingest_many(self,
+                    records: Iterable[Union[Dict, List, pd.DataFrame]],
+                    dimensions: int = 4,
+                    batch_size: int = 1000) -> List[str]:
+        """
+        Absorbe un flujo de registros repartiéndolo entre fragmentos
+        
+        Cada lote se serializa una vez en este proceso para obtener los IDs;
+        después cada fragmento comprime y escribe su parte en paralelo, con
+        su propia transacción. A los procesos solo viajan (ID, serializado).
+        
+        Args:
+            records: Iterable de datos a comprimir
+            dimensions: Dimensiones de compresión
+            batch_size: Registros por lote (repartidos entre fragmentos)
+            
+        Returns:
+            IDs cuánticos en el orden de entrada
+        """
+        serializer = self.shards[0]
+        records = iter(records)
+        data_ids = []
+        with self._executor() as executor:
+            while True:
+                batch = list(islice(records, batch_size))
+                if not batch:
+                    break
+                serialized = [serializer._serialize_record(data) for data in batch]
+                
+                groups = {}
+                for item in serialized:
+                    groups.setdefault(self.shard_index(item[0]), []).append(item)
+                    
+                # Un solo escritor por fragmento y lote: sin bloqueos entre procesos
+                if self.processes:
+                    self._get_pool().map(_ingest_shard_task, [
+                        (self.shards[index].event_horizon, self.options, items, dimensions)
+                        for index, items in groups.items()])
+                else:
+                    futures = [executor.submit(self.shards[index]._ingest_batch, items, dimensions)
+                               for index, items in groups.items()]
+                    for future in futures:
+                        future.result()
+                data_ids.extend(data_id for data_id, _ in serialized)
+                
+        return data_ids
+    
+    def retrieve_data(self, data_id: str, **kwargs) -> Union[Dict, List, pd.DataFrame]:
+        """Recupera datos desde el fragmento que los almacena"""
+        return self.shard_for(data_id).retrieve_data(data_id, **kwargs)
+    
+    def retrieve_many(self,
+                      data_ids: Iterable[str],
+                      cache_mode: Optional[str] = None) -> List[Union[Dict, List, pd.DataFrame]]:
+        """Recupera varios IDs consultando en paralelo cada fragmento implicado"""
+        data_ids = list(data_ids)
+        groups = {}
+        for data_id in data_ids:
+            groups.setdefault(self.shard_index(data_id), []).append(data_id)
+            
+        found = {}
+        with self._executor() as executor:
+            futures = {index: executor.submit(self.shards[index].retrieve_many, ids, cache_mode)
+                       for index, ids in groups.items()}
+            for index, future in futures.items():
+                found.update(zip(groups[index], future.result()))
+        return [found[data_id] for data_id in data_ids]
+    
+    def verify_all(self, **kwargs) -> Dict:
+        """Ejecuta verify_all en todos los fragmentos a la vez y combina los informes"""
+        with self._executor() as executor:
+            reports = list(executor.map(lambda shard: shard.verify_all(**kwargs), self.shards))
+        return {
+            'checked': sum(report['checked'] for report in reports),
+            'bytes': sum(report['bytes'] for report in reports),
+            'corrupt': [data_id for report in reports for data_id in report['corrupt']],
+            'completed': all(report['completed'] for report in reports),
+            'elapsed': max(report['elapsed'] for report in reports)
+        }
+    
+    def rebalance(self, event_horizons: List[str], batch_size: int = 500) -> int:
+        """
+        Redistribuye las filas para un nuevo conjunto de fragmentos
+        
+        Primero se copian en crudo las filas mal ubicadas a su nuevo
+        fragmento; después se activa la nueva topología y solo entonces se
+        borran los originales, así que las lecturas nunca fallan. No debe
+        ingerirse nada mientras dura el rebalanceo. Para mover el mínimo de
+        filas, los fragmentos nuevos van al final de event_horizons.
+        
+        Args:
+            event_horizons: Connection strings de la nueva topología
+            batch_size: Filas por transacción
+            
+        Returns:
+            Número de filas movidas
+        """
+        current = {shard.event_horizon: shard for shard in self.shards}
+        new_shards = [current.get(event_horizon) or self._open_shard(event_horizon)
+                      for event_horizon in event_horizons]
+        old_shards = self.shards
+        
+        def misplaced(shard, page):
+            return [data_id for data_id in page
+                    if new_shards[self.shard_index(data_id, len(new_shards))] is not shard]
+        
+        moved = 0
+        for shard in old_shards:
+            for page in shard._id_pages(batch_size):
+                groups = {}
+                for data_id in misplaced(shard, page):
+                    groups.setdefault(self.shard_index(data_id, len(new_shards)), []).append(data_id)
+                for index, ids in groups.items():
+                    moved += len(shard.create_wormhole(new_shards[index]).transfer_data(
+                        ids, batch_size=batch_size))
+                    
+        self.shards = new_shards
+        for shard in old_shards:
+            for page in shard._id_pages(batch_size):
+                stale = misplaced(shard, page)
+                if stale:
+                    with shard.Session() as session:
+                        shard._delete_rows(session, stale)
+                        session.commit()
+        return moved
+
+_worker_shards = {}
+
+def _ingest_shard_task(task):
+    """Comprime y escribe un lote en un fragmento dentro de un proceso del pool"""
+    event_horizon, options, serialized, dimensions = task
+    shard = _worker_shards.get(event_horizon)
+    if shard is None:
+        shard = _worker_shards[event_horizon] = DataSingularity(
+            event_horizon=event_horizon, **options)
+    shard._ingest_batch(serialized, dimensions)
 
 class WormholeConnection:
     def __init__(self, source, target):
         self.source = source
+        if isinstance(target, str):
+            target = DataSingularity(event_horizon=target,
+                                     compression_level=source.compression,
+                                     quantum_storage=source.quantum)
         self.target = target
         self._open_wormhole()
         
     def _open_wormhole(self):
         """Establece el túnel de transferencia cuántica"""
         self.tunnel = QuantumTunnel(
-            source_db=self.source.event_horizon,
+            source_db=self.source,
             target_db=self.target
         )
     
-    def transfer_data(self, data_ids: List[str]):
-        """Transfiere datos a través del agujero de gusano"""
+    def transfer_data(self, 
+                      data_ids: List[str],
+                      batch_size: int = 500,
+                      workers: int = 4,
+                      raw: bool = True) -> List[str]:
+        """
+        Transfiere datos a través del agujero de gusano
+        
+        En modo raw los blobs comprimidos y sus hashes se copian tal cual,
+        por lotes transaccionales, sin descomprimir ni recomprimir. Los IDs
+        que el destino ya tiene no se copian.
+        
+        Args:
+            data_ids: IDs cuánticos a transferir
+            batch_size: IDs por transacción en el destino
+            workers: Lotes simultáneos (solo si ningún extremo es SQLite)
+            raw: False vuelve a la ruta retrieve_data/ingest_data
+            
+        Returns:
+            IDs presentes en el destino tras la transferencia, en orden
+        """
+        if not raw:
+            return self._transfer_decoded(data_ids)
+            
+        data_ids = list(data_ids)
+        batches = [data_ids[start:start + batch_size]
+                   for start in range(0, len(data_ids), batch_size)]
+        if workers > 1 and len(batches) > 1 and self._parallel_allowed():
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                transferred = list(executor.map(self._transfer_batch, batches))
+        else:
+            transferred = [self._transfer_batch(batch) for batch in batches]
+            
+        return [data_id for batch in transferred for data_id in batch]
+    
+    def _transfer_batch(self, batch):
+        """Copia un lote de filas crudas omitiendo las que ya existen en destino"""
+        with self.target.Session() as session:
+            existing = self.target._existing_ids(session, batch)
+        missing = [data_id for data_id in batch if data_id not in existing]
+        
+        rows = self.source._export_rows(missing) if missing else []
+        found = {row['id'] for row in rows}
+        for data_id in missing:
+            if data_id not in found:
+                print(f"Error transfiriendo {data_id}: Datos no encontrados en la singularidad")
+                
+        self._transfer_dictionaries(rows)
+        if rows:
+            with self.target.Session() as session:
+                inserted = set(self.target._insert_rows(session, rows))
+                # Los trozos de objetos grandes viajan uno a uno en la misma transacción
+                for row in rows:
+                    if row.get('chunks') and row['id'] in inserted:
+                        for chunk in self.source._export_chunks(row['id']):
+                            session.execute(self.target.chunk_table.insert(), chunk)
+                session.commit()
+        return [data_id for data_id in batch if data_id in existing or data_id in found]
+    
+    def _transfer_dictionaries(self, rows):
+        """Copia los diccionarios que referencian las filas y faltan en destino"""
+        dictionary_ids = {row['dictionary_id'] for row in rows
+                          if row.get('dictionary_id') is not None}
+        dictionary_ids -= set(self.target.compressor.dictionaries)
+        for row in self.source._export_dictionaries(dictionary_ids):
+            self.target._restore_dictionary(row, row['dictionary'])
+            self.target.compressor.load_dictionary(row['id'], row['dictionary'])
+    
+    def _parallel_allowed(self):
+        """SQLite serializa las escrituras: solo se paraleliza entre motores servidor"""
+        return all(singularity.engine.dialect.name != 'sqlite'
+                   for singularity in (self.source, self.target))
+    
+    def _transfer_decoded(self, data_ids):
+        """Transferencia registro a registro recomprimiendo en el destino"""
         successful = []
         for data_id in data_ids:
             try:
@@ -210,43 +1714,333 @@ class SingularityError(Exception):
 # =============================================
 
 class QuantumCompressor:
-    """Compresión basada en algoritmos cuánticos"""
-    def __init__(self, level=0.9):
+    """
+    Compresión basada en algoritmos cuánticos
+    
+    Cada blob lleva una cabecera MAGIC + etiqueta del códec con el que se
+    comprimió. Los blobs sin cabecera son zlib de versiones anteriores
+    (siempre empiezan por 0x78) y se siguen descomprimiendo.
+    """
+    MAGIC = b'\xc5'
+    ZDICT_TAG = 4
+    
+    # nombre -> (etiqueta, compresor(datos, nivel 0-9), descompresor)
+    CODECS = {}
+    _CODEC_TAGS = {}
+    
+    def __init__(self, level=0.9, codec='auto',
+                 hot_threshold=64 * 1024, bulk_threshold=1024 * 1024,
+                 sample_size=16 * 1024, min_ratio=0.9):
+        """
+        Args:
+            level: Nivel de compresión (0.1-1.0)
+            codec: Códec fijo o 'auto' para elegirlo por registro
+            hot_threshold: Bytes por debajo de los cuales se usa un códec rápido
+            bulk_threshold: Bytes a partir de los cuales se usa un códec denso
+            sample_size: Bytes de muestra para estimar la compresibilidad
+            min_ratio: Ratio de la muestra por encima del cual no se comprime
+        """
+        if codec not in ('auto', 'zdict') and codec not in self.CODECS:
+            raise ValueError(f"Códec de compresión desconocido: {codec}")
         self.level = level
+        self.codec = codec
+        self.hot_threshold = hot_threshold
+        self.bulk_threshold = bulk_threshold
+        self.sample_size = sample_size
+        self.min_ratio = min_ratio
+        self.dictionaries = {}
+        self.active_dictionary = None
+        self.dictionary_loader = None
         
-    def compress(self, data):
+    @classmethod
+    def register_codec(cls, name, tag, compress, decompress):
+        """Registra un códec identificado por una etiqueta de un byte"""
+        if tag in cls._CODEC_TAGS and cls._CODEC_TAGS[tag] != name:
+            raise ValueError(f"Etiqueta de códec {tag} ya asignada")
+        cls.CODECS[name] = (tag, compress, decompress)
+        cls._CODEC_TAGS[tag] = name
+        
+    def select_codec(self, data):
+        """Política adaptativa: códec según tamaño y ratio de una muestra"""
+        return self._select_codec(data)[:2]
+    
+    def _select_codec(self, data):
+        """(códec, nivel, sonda): la sonda es el zlib-1 del registro si la muestra lo cubría"""
+        if self.codec != 'auto':
+            return self.codec, self._zlevel(), None
+        # Registros pequeños con claves repetidas: diccionario compartido
+        if self.active_dictionary is not None and len(data) < self.hot_threshold:
+            return 'zdict', self._zlevel(), None
+        sample = data[:self.sample_size]
+        probe = zlib.compress(sample, 1) if sample else b''
+        if not sample or len(probe) / len(sample) > self.min_ratio:
+            return 'none', 0, None
+        if len(data) < self.hot_threshold:
+            return 'zlib', 1, probe if len(sample) == len(data) else None
+        if len(data) >= self.bulk_threshold:
+            return 'lzma', self._zlevel(), None
+        return 'zlib', self._zlevel(), None
+        
+    def _zlevel(self):
+        """Nivel 0-9 equivalente al nivel de compresión configurado"""
+        return int(self.level * 9)
+        
+    def compress(self, data, codec=None):
         """Aplica compresión cuántica a los datos"""
         # Implementación real usaría algoritmos cuánticos
-        return zlib.compress(data, level=int(self.level * 9))
+        probe = None
+        if codec is None:
+            codec, level, probe = self._select_codec(data)
+        else:
+            level = self._zlevel()
+        if codec == 'zdict':
+            return self._compress_zdict(data, level)
+        tag, compressor, _ = self.CODECS[codec]
+        # Registro pequeño: la muestra de select_codec ya es su zlib-1 completo
+        return self.MAGIC + bytes([tag]) + (probe if probe is not None else compressor(data, level))
     
     def decompress(self, data):
         """Revierte la compresión cuántica"""
-        return zlib.decompress(data)
+        if data[:1] != self.MAGIC:
+            return zlib.decompress(data)
+        codec = self.codec_of(data)
+        if codec == 'zdict':
+            return self._decompress_zdict(data)
+        return self.CODECS[codec][2](data[2:])
+    
+    # Claves JSON (con sus dos puntos) y cadenas cortas
+    _TOKEN_PATTERN = re.compile(rb'"(?:[^"\\]|\\.){1,64}"\s*:\s*|"(?:[^"\\]|\\.){1,64}"')
+    
+    @staticmethod
+    def train_dictionary(samples, size=32 * 1024):
+        """
+        Construye un diccionario zlib (zdict) a partir de registros de muestra
+        
+        Las muestras son registros únicos (IDs de contenido), así que lo que
+        se repite son sus fragmentos: claves y cadenas JSON. Cada fragmento
+        puntúa por el número de muestras en que aparece por su longitud.
+        zlib solo usa los últimos 32 KB y las coincidencias más cercanas al
+        final son las más baratas, así que los fragmentos mejor puntuados
+        (hasta una cuarta parte) quedan al final, precedidos por las
+        muestras más recientes que conservan la estructura de los registros.
+        """
+        document_frequency = {}
+        for sample in samples:
+            for token in set(QuantumCompressor._TOKEN_PATTERN.findall(sample)):
+                document_frequency[token] = document_frequency.get(token, 0) + 1
+        recurring = [token for token, count in document_frequency.items() if count > 1]
+        recurring.sort(key=lambda token: document_frequency[token] * len(token))
+        ranked = b''.join(recurring)[-size // 4:]
+        return (b''.join(samples) + ranked)[-size:]
+    
+    @staticmethod
+    def dictionary_id(dictionary):
+        """ID de contenido (32 bits) de un diccionario"""
+        return int.from_bytes(hashlib.sha3_256(dictionary).digest()[:4], 'big')
+    
+    def load_dictionary(self, dictionary_id, dictionary, activate=False):
+        """Registra un diccionario y opcionalmente lo usa para nuevos registros"""
+        self.dictionaries[dictionary_id] = dictionary
+        if activate:
+            self.active_dictionary = dictionary_id
+            
+    def dictionary_of(self, data):
+        """ID del diccionario con el que se comprimió un blob (None si no usa)"""
+        if data[:1] == self.MAGIC and data[1:2] == bytes([self.ZDICT_TAG]):
+            return int.from_bytes(data[2:6], 'big')
+        return None
+    
+    def _get_dictionary(self, dictionary_id):
+        """Diccionario por ID, consultando al cargador si no está en memoria"""
+        if dictionary_id not in self.dictionaries and self.dictionary_loader:
+            dictionary = self.dictionary_loader(dictionary_id)
+            if dictionary is not None:
+                self.dictionaries[dictionary_id] = dictionary
+        try:
+            return self.dictionaries[dictionary_id]
+        except KeyError:
+            raise SingularityError(f"Diccionario de compresión {dictionary_id} no disponible")
+    
+    def _compress_zdict(self, data, level):
+        """Deflate crudo con el diccionario activo; cabecera + ID de 4 bytes"""
+        if self.active_dictionary is None:
+            raise SingularityError("No hay diccionario de compresión activo")
+        compressor = zlib.compressobj(
+            level, zlib.DEFLATED, -15, zdict=self._get_dictionary(self.active_dictionary))
+        return (self.MAGIC + bytes([self.ZDICT_TAG])
+                + self.active_dictionary.to_bytes(4, 'big')
+                + compressor.compress(data) + compressor.flush())
+    
+    def _decompress_zdict(self, data):
+        """Revierte _compress_zdict con el diccionario referenciado en el blob"""
+        decompressor = zlib.decompressobj(
+            -15, zdict=self._get_dictionary(self.dictionary_of(data)))
+        return decompressor.decompress(data[6:]) + decompressor.flush()
+    
+    def codec_of(self, data):
+        """Nombre del códec con el que se comprimió un blob"""
+        if data[:1] != self.MAGIC:
+            return 'zlib'
+        try:
+            return self._CODEC_TAGS[data[1]]
+        except KeyError:
+            raise SingularityError(f"Códec de compresión desconocido: {data[1]}")
+
+QuantumCompressor.register_codec(
+    'none', 0, lambda data, level: data, lambda data: data)
+QuantumCompressor.register_codec(
+    'zlib', 1, lambda data, level: zlib.compress(data, level), zlib.decompress)
+QuantumCompressor.register_codec(
+    'lzma', 2, lambda data, level: lzma.compress(data, preset=level), lzma.decompress)
+QuantumCompressor.register_codec(
+    'bz2', 3, lambda data, level: bz2.compress(data, max(1, level)), bz2.decompress)
+# Códec con estado (diccionario compartido): se resuelve en compress/decompress
+QuantumCompressor._CODEC_TAGS[QuantumCompressor.ZDICT_TAG] = 'zdict'
 
 class ChronoIndexer:
     """Indexación temporal multidimensional"""
-    def create_index(self, data):
+    def create_index(self, data, data_id=None, timestamp=None):
         """Genera índice temporal para los datos"""
+        timestamp = time.time() if timestamp is None else timestamp
         return {
-            'ingestion_time': datetime.utcnow().isoformat(),
-            'temporal_vectors': self._generate_temporal_vectors(data)
+            'ingestion_time': datetime.utcfromtimestamp(timestamp).isoformat(),
+            'temporal_vectors': self._generate_temporal_vectors(data, data_id)
         }
     
-    def _generate_temporal_vectors(self, data):
+    def _generate_temporal_vectors(self, data, data_id=None):
         """Analiza propiedades temporales en los datos"""
-        # En una implementación real esto analizaría marcas temporales
-        return [hashlib.md5(str(data).encode()).hexdigest()]
+        # El ID de contenido ya identifica los datos: no se vuelve a
+        # hashear str(data), que es muy costoso en DataFrames grandes
+        return [data_id] if data_id else []
+    
+    def to_epoch(self, value):
+        """Convierte datetime, ISO 8601 o epoch a segundos epoch (UTC si no hay zona)"""
+        if isinstance(value, (int, float)):
+            return float(value)
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
 
 class QuantumTunnel:
     """Conexión cuántica entre singularidades"""
     def __init__(self, source_db, target_db):
+        if isinstance(source_db, str):
+            source_db = DataSingularity(event_horizon=source_db)
+        if isinstance(target_db, str):
+            target_db = DataSingularity(event_horizon=target_db)
         self.source = source_db
         self.target = target_db
         
-    def sync_singularities(self):
-        """Sincroniza dos singularidades completas"""
-        # Implementación real transferiría datos en paralelo
-        print(f"Estableciendo túnel cuántico {self.source} -> {self.target}")
+    def sync_singularities(self,
+                           bidirectional: bool = False,
+                           batch_size: int = 500,
+                           checkpoint: Optional[str] = None,
+                           progress=None) -> Dict:
+        """
+        Sincroniza dos singularidades completas
+        
+        Ambos extremos comparan resúmenes XOR de sus IDs de contenido nivel
+        a nivel de prefijo hexadecimal (árbol tipo Merkle) y solo bajan por
+        las ramas que difieren. Únicamente se listan los IDs de los cubos
+        hoja distintos y se copian en crudo las filas que faltan, así que el
+        coste depende de las diferencias y no del total de filas.
+        
+        Args:
+            bidirectional: También copia al origen lo que solo tiene el destino
+            batch_size: Filas por transacción de copia
+            checkpoint: Fichero JSON con los cubos pendientes; si existe al
+                empezar, la sincronización se reanuda desde él
+            progress: Callable(cubos_hechos, cubos_totales, filas_copiadas)
+            
+        Returns:
+            Estadísticas de la sincronización
+        """
+        print(f"Estableciendo túnel cuántico {self.source.event_horizon} -> "
+              f"{self.target.event_horizon}")
+        started = time.perf_counter()
+        
+        state = self._load_checkpoint(checkpoint)
+        if state is None:
+            state = {'source': self.source.event_horizon,
+                     'target': self.target.event_horizon,
+                     'buckets': self._diff_buckets(), 'done': 0, 'transferred': 0}
+            self._save_checkpoint(checkpoint, state)
+            
+        forward = WormholeConnection(self.source, self.target)
+        backward = WormholeConnection(self.target, self.source) if bidirectional else None
+        buckets = state['buckets']
+        total = len(buckets)
+        pending_ids = []
+        
+        def flush(done):
+            # Los cubos solo se marcan hechos cuando sus filas están confirmadas
+            if pending_ids:
+                forward.transfer_data([data_id for direction, data_id in pending_ids
+                                       if direction == 'forward'], batch_size=batch_size)
+                if backward:
+                    backward.transfer_data([data_id for direction, data_id in pending_ids
+                                            if direction == 'backward'], batch_size=batch_size)
+                state['transferred'] += len(pending_ids)
+                pending_ids.clear()
+            state['done'] = done
+            self._save_checkpoint(checkpoint, state)
+            if progress:
+                progress(done, total, state['transferred'])
+                
+        for position in range(state['done'], total):
+            source_ids = set(self.source.bucket_ids(buckets[position]))
+            target_ids = set(self.target.bucket_ids(buckets[position]))
+            pending_ids.extend(('forward', data_id)
+                               for data_id in sorted(source_ids - target_ids))
+            if backward:
+                pending_ids.extend(('backward', data_id)
+                                   for data_id in sorted(target_ids - source_ids))
+            if len(pending_ids) >= batch_size:
+                flush(position + 1)
+        flush(total)
+        
+        if checkpoint and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        return {
+            'buckets': total,
+            'transferred': state['transferred'],
+            'elapsed': time.perf_counter() - started
+        }
+    
+    def _diff_buckets(self):
+        """Cubos hoja cuyo resumen difiere, descendiendo solo por ramas distintas"""
+        prefixes = ['']
+        for depth in range(DataSingularity.DIGEST_PREFIX + 1):
+            source = self.source.sync_digests(prefixes, depth)
+            target = self.target.sync_digests(prefixes, depth)
+            prefixes = sorted(prefix for prefix in source.keys() | target.keys()
+                              if source.get(prefix) != target.get(prefix))
+            if not prefixes:
+                break
+        return prefixes
+    
+    def _load_checkpoint(self, checkpoint):
+        """Estado de una sincronización interrumpida entre los mismos extremos"""
+        if not checkpoint or not os.path.exists(checkpoint):
+            return None
+        with open(checkpoint) as f:
+            state = json.load(f)
+        if (state.get('source'), state.get('target')) != (self.source.event_horizon,
+                                                          self.target.event_horizon):
+            raise SingularityError("El checkpoint pertenece a otra pareja de singularidades")
+        return state
+    
+    @staticmethod
+    def _save_checkpoint(checkpoint, state):
+        """Guarda el estado de forma atómica (escritura y rename)"""
+        if not checkpoint:
+            return
+        temporary = f"{checkpoint}.tmp"
+        with open(temporary, 'w') as f:
+            json.dump(state, f)
+        os.replace(temporary, checkpoint)
 
 # =============================================
 # INTERFAZ DE OPERACIÓN
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# =============================================
+# Pruebas de la caché y la coalescencia de APIFolder
+# contra un agujero de gusano local (servidor aiohttp)
+# =============================================
+
+import asyncio
+import hashlib
+import json
+from types import SimpleNamespace
+
+from aiohttp import web
+from multidict import CIMultiDict
+
+import api_fold
+
+
+class FakeRequest:
+    """Petición mínima con la interfaz que usa fold_request"""
+    def __init__(self, data, method='GET', path='/q', headers=None):
+        self.data = data
+        self.method = method
+        self.path = path
+        self.path_qs = path
+        self.headers = CIMultiDict(headers or {})
+
+    async def json(self):
+        return self.data
+
+
+def _signature(data):
+    return hashlib.sha3_256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+async def _safe():
+    return True
+
+
+async def _run(scenario, **folder_options):
+    """Arranca el agujero de gusano local, ejecuta el escenario y lo cierra"""
+    upstream = SimpleNamespace(calls=[], fail=False)
+
+    async def fold(request):
+        body = await request.json()
+        upstream.calls.append(body['headers'])
+        await asyncio.sleep(0.05)
+        if upstream.fail:
+            return web.Response(status=500)
+        # La respuesta depende de las credenciales, como en un backend real
+        data = {'echo': body['data'],
+                'user': body['headers'].get('Cookie') or body['headers'].get('Authorization')}
+        return web.json_response({'folded_data': data, 'quantum_hash': _signature(data)})
+
+    app = web.Application()
+    app.router.add_post('/fold', fold)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    folder = api_fold.APIFolder(**folder_options)
+    folder.chrono_lock = SimpleNamespace(check_temporal_safety=_safe)
+    folder.folder.unfold = lambda data, compression: data
+    folder.add_wormhole('default', f'http://127.0.0.1:{port}/fold', 'unused', warmup=0)
+    try:
+        return await scenario(folder, upstream), upstream.calls
+    finally:
+        await folder.close_pools()
+        await runner.cleanup()
+
+
+def _user(response):
+    return json.loads(response.body)['user']
+
+
+def test_cache_separates_cookies():
+    """Usuarios con distinta Cookie nunca comparten una respuesta cacheada"""
+    async def scenario(folder, upstream):
+        alice = await folder.fold_request(FakeRequest({'k': 1}, headers={'Cookie': 'session=alice'}))
+        bob = await folder.fold_request(FakeRequest({'k': 1}, headers={'Cookie': 'session=bob'}))
+        again = await folder.fold_request(FakeRequest({'k': 1}, headers={'Cookie': 'session=alice'}))
+        return alice, bob, again
+
+    (alice, bob, again), calls = asyncio.run(_run(scenario, cache_bytes=10000))
+    assert (_user(alice), _user(bob), _user(again)) == ('session=alice', 'session=bob', 'session=alice')
+    assert len(calls) == 2
+
+
+def test_cache_separates_credentials():
+    """Authorization y cualquier otra cabecera reenviada forman parte de la clave"""
+    async def scenario(folder, upstream):
+        first = await folder.fold_request(FakeRequest({'k': 1}, headers={'Authorization': 'Bearer a'}))
+        second = await folder.fold_request(FakeRequest({'k': 1}, headers={'Authorization': 'Bearer b'}))
+        await folder.fold_request(FakeRequest({'k': 1}, headers={'Authorization': 'Bearer a',
+                                                                  'X-Api-Key': 'other'}))
+        return first, second
+
+    (first, second), calls = asyncio.run(_run(scenario, cache_bytes=10000))
+    assert (_user(first), _user(second)) == ('Bearer a', 'Bearer b')
+    assert len(calls) == 3
+
+
+def test_unkeyed_headers_still_hit():
+    """Las cabeceras de UNKEYED_HEADERS no fragmentan la caché"""
+    async def scenario(folder, upstream):
+        for request_id in ('1', '2'):
+            await folder.fold_request(FakeRequest({'k': 1}, headers={'Cookie': 'session=alice',
+                                                                      'X-Request-Id': request_id}))
+        return folder.cache_stats()
+
+    stats, calls = asyncio.run(_run(scenario, cache_bytes=10000))
+    assert len(calls) == 1
+    assert stats['hits'] == 1
+
+
+def test_cache_entries_expire():
+    """Una respuesta caducada se vuelve a pedir al agujero de gusano"""
+    async def scenario(folder, upstream):
+        await folder.fold_request(FakeRequest({'k': 1}))
+        await folder.fold_request(FakeRequest({'k': 1}))
+        await asyncio.sleep(0.15)
+        await folder.fold_request(FakeRequest({'k': 1}))
+        return folder.cache_stats()
+
+    stats, calls = asyncio.run(_run(scenario, cache_bytes=10000, cache_ttl=0.1))
+    assert len(calls) == 2
+    assert (stats['hits'], stats['expired']) == (1, 1)
+
+
+def test_cache_is_bounded_by_bytes():
+    """La caché desaloja por LRU sin superar cache_bytes"""
+    async def scenario(folder, upstream):
+        for n in range(10):
+            await folder.fold_request(FakeRequest({'n': n}))
+        stats = folder.cache_stats()
+        before = len(upstream.calls)
+        await folder.fold_request(FakeRequest({'n': 9}))
+        newest_hit = len(upstream.calls) == before
+        await folder.fold_request(FakeRequest({'n': 0}))
+        oldest_hit = len(upstream.calls) == before
+        return stats, newest_hit, oldest_hit
+
+    (stats, newest_hit, oldest_hit), _ = asyncio.run(_run(scenario, cache_bytes=100))
+    assert 0 < stats['bytes'] <= 100
+    assert stats['entries'] < 10
+    assert newest_hit and not oldest_hit
+
+
+def test_non_idempotent_requests_bypass():
+    """Los POST no se cachean ni se agrupan salvo que la ruta lo permita"""
+    async def scenario(folder, upstream):
+        await asyncio.gather(*(folder.fold_request(FakeRequest({'k': 1}, method='POST'))
+                               for _ in range(3)))
+        posts = len(upstream.calls)
+        folder.set_route_policy('/search', idempotent=True)
+        await asyncio.gather(*(folder.fold_request(FakeRequest({'k': 1}, method='POST',
+                                                               path='/search'))
+                               for _ in range(3)))
+        await folder.fold_request(FakeRequest({'k': 1}, method='POST', path='/search'))
+        return posts
+
+    posts, calls = asyncio.run(_run(scenario, cache_bytes=10000, coalesce=True))
+    assert posts == 3
+    assert len(calls) == 4
+
+
+def test_coalescing_is_opt_in():
+    """Sin coalesce ni caché, cada petición simultánea llega al agujero de gusano"""
+    async def scenario(folder, upstream):
+        return await asyncio.gather(*(
+            folder.fold_request(FakeRequest({'k': 1}, headers={'Cookie': f'session={user}'}))
+            for user in ('alice', 'bob', 'alice')))
+
+    responses, calls = asyncio.run(_run(scenario))
+    assert [_user(response) for response in responses] == [
+        'session=alice', 'session=bob', 'session=alice']
+    assert len(calls) == 3
+
+
+def test_coalescing_keys_on_credentials():
+    """Con coalesce, solo las peticiones con las mismas credenciales comparten llamada"""
+    async def scenario(folder, upstream):
+        return await asyncio.gather(*(
+            folder.fold_request(FakeRequest({'k': 1}, headers={'Cookie': f'session={user}'}))
+            for user in ('alice', 'bob', 'alice', 'bob')))
+
+    responses, calls = asyncio.run(_run(scenario, coalesce=True))
+    assert [_user(response) for response in responses] == [
+        'session=alice', 'session=bob', 'session=alice', 'session=bob']
+    assert len(calls) == 2
+
+
+def test_coalesced_errors_fan_out():
+    """Un fallo agrupado llega a cada petición como su propia excepción y no se cachea"""
+    async def scenario(folder, upstream):
+        upstream.fail = True
+        errors = await asyncio.gather(*(folder.fold_request(FakeRequest({'k': 1}))
+                                        for _ in range(3)), return_exceptions=True)
+        in_flight = folder.cache_stats()['in_flight']
+        upstream.fail = False
+        recovered = await folder.fold_request(FakeRequest({'k': 1}))
+        return errors, in_flight, recovered
+
+    (errors, in_flight, recovered), calls = asyncio.run(
+        _run(scenario, cache_bytes=10000, coalesce=True))
+    assert all(isinstance(error, web.HTTPServiceUnavailable) for error in errors)
+    assert len({id(error) for error in errors}) == 3
+    assert in_flight == 0
+    assert json.loads(recovered.body)['echo'] == {'k': 1}
+    assert len(calls) == 2
+
+
+async def _run_pooled(scenario, **pool_options):
+    """Como _run, pero con pools precalentados por start_pools (HEAD incluido)"""
+    async def fold(request):
+        body = await request.json()
+        await asyncio.sleep(0.02)
+        data = {'echo': body['data']}
+        return web.json_response({'folded_data': data, 'quantum_hash': _signature(data)})
+
+    async def head(request):
+        # Con cuerpo y Content-Length la conexión de precalentamiento vuelve al pool
+        return web.Response(text='ok')
+
+    app = web.Application()
+    app.router.add_post('/fold', fold)
+    app.router.add_route('HEAD', '/fold', head)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    folder = api_fold.APIFolder()
+    folder.chrono_lock = SimpleNamespace(check_temporal_safety=_safe)
+    folder.folder.unfold = lambda data, compression: data
+    for name in ('default', 'emergency'):
+        folder.add_wormhole(name, f'http://127.0.0.1:{port}/fold', 'unused', **pool_options)
+    try:
+        await folder.start_pools()
+        return await scenario(folder)
+    finally:
+        await folder.close_pools()
+        await runner.cleanup()
+
+
+def test_warm_up_connections_are_reused():
+    """Las primeras peticiones usan las conexiones abiertas por start_pools"""
+    async def scenario(folder):
+        warm = dict(folder.pool_stats()['default'])
+        for n in range(2):
+            await folder.fold_request(FakeRequest({'n': n}))
+        return warm, folder.pool_stats()['default']
+
+    warm, stats = asyncio.run(_run_pooled(scenario, max_connections=4, warmup=2))
+    assert warm['connections_created'] == 2
+    assert stats['connections_created'] == 2
+    assert stats['connections_reused'] >= 2
+
+
+def test_pool_bounds_connections_and_queues():
+    """Una ráfaga mayor que el pool reutiliza max_connections conexiones y espera en cola"""
+    async def scenario(folder):
+        responses = await asyncio.gather(*(folder.fold_request(FakeRequest({'n': n}))
+                                           for n in range(40)))
+        return responses, folder.pool_stats()['default']
+
+    responses, stats = asyncio.run(_run_pooled(scenario, max_connections=4, warmup=2))
+    assert [json.loads(response.body)['echo'] for response in responses] == [
+        {'n': n} for n in range(40)]
+    assert stats['connections_created'] == 4
+    assert stats['connections_reused'] >= 40 - 2
+    assert stats['max_queued'] > 0
+    assert (stats['in_flight'], stats['queued'], stats['errors']) == (0, 0, 0)
+    assert stats['requests'] == 42 and stats['limit'] == 4
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# =============================================
+# Pruebas de sincronización entre singularidades
+# con ficheros SQLite locales en ambos extremos
+# =============================================
+
+import json
+
+import pytest
+
+from db_singularity import DataSingularity, QuantumTunnel, SingularityError
+
+
+class Interrupted(Exception):
+    """Corte simulado de una sincronización a medias"""
+
+
+def _singularity(tmp_path, name):
+    return DataSingularity(event_horizon=f"sqlite:///{tmp_path / name}.db")
+
+
+def _ids(singularity):
+    return {data_id for page in singularity._id_pages() for data_id in page}
+
+
+def _records(start, stop):
+    return [{'sensor': n, 'reading': n * 0.5} for n in range(start, stop)]
+
+
+def test_sync_copies_only_the_difference(tmp_path):
+    """Solo se listan los cubos distintos y solo se copian las filas que faltan"""
+    source = _singularity(tmp_path, 'source')
+    target = _singularity(tmp_path, 'target')
+    source.ingest_many(_records(0, 200))
+    target.ingest_many(_records(0, 150))
+
+    stats = QuantumTunnel(source, target).sync_singularities(batch_size=20)
+
+    assert stats['transferred'] == 50
+    assert stats['buckets'] <= 50
+    assert _ids(target) == _ids(source)
+    assert target.retrieve_data(source.ingest_data(_records(199, 200)[0])) == _records(199, 200)[0]
+    assert QuantumTunnel(source, target).sync_singularities()['buckets'] == 0
+
+
+def test_bidirectional_sync_merges_both_sides(tmp_path):
+    """Con bidirectional cada extremo recibe lo que solo tiene el otro"""
+    source = _singularity(tmp_path, 'source')
+    target = _singularity(tmp_path, 'target')
+    source.ingest_many(_records(0, 60))
+    target.ingest_many(_records(40, 100))
+
+    stats = QuantumTunnel(source, target).sync_singularities(bidirectional=True, batch_size=25)
+
+    assert stats['transferred'] == 80
+    assert _ids(source) == _ids(target)
+    assert len(_ids(source)) == 100
+    # Los resúmenes incrementales coinciden con los recalculados desde cero
+    digests = target.sync_digests([''], 1)
+    target.rebuild_digests()
+    assert target.sync_digests([''], 1) == digests
+
+
+def test_sync_resumes_from_checkpoint(tmp_path):
+    """Una sincronización cortada continúa desde su checkpoint sin repetir cubos"""
+    source = _singularity(tmp_path, 'source')
+    target = _singularity(tmp_path, 'target')
+    source.ingest_many(_records(0, 120))
+    checkpoint = tmp_path / 'sync.json'
+
+    def interrupt(done, total, transferred):
+        if done < total:
+            raise Interrupted()
+
+    with pytest.raises(Interrupted):
+        QuantumTunnel(source, target).sync_singularities(
+            batch_size=10, checkpoint=str(checkpoint), progress=interrupt)
+    state = json.loads(checkpoint.read_text())
+    assert 0 < state['done'] < len(state['buckets'])
+    partial = _ids(target)
+    assert 0 < len(partial) < 120
+
+    seen = []
+    stats = QuantumTunnel(source, target).sync_singularities(
+        batch_size=10, checkpoint=str(checkpoint),
+        progress=lambda done, total, transferred: seen.append(done))
+
+    assert seen[0] > state['done']
+    assert stats['transferred'] == 120
+    assert _ids(target) == _ids(source)
+    assert not checkpoint.exists()
+
+
+def test_checkpoint_from_other_pair_is_rejected(tmp_path):
+    """Un checkpoint de otra pareja de singularidades no se reutiliza"""
+    source = _singularity(tmp_path, 'source')
+    target = _singularity(tmp_path, 'target')
+    checkpoint = tmp_path / 'sync.json'
+    checkpoint.write_text(json.dumps({'source': 'sqlite:///other.db', 'target': 'x',
+                                      'buckets': [], 'done': 0, 'transferred': 0}))
+
+    with pytest.raises(SingularityError, match='otra pareja'):
+        QuantumTunnel(source, target).sync_singularities(checkpoint=str(checkpoint))